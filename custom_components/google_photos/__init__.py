@@ -3,6 +3,8 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
+import shutil
 from typing import Any
 
 from homeassistant import config_entries
@@ -10,25 +12,91 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 from homeassistant.exceptions import ConfigEntryNotReady
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.storage import STORAGE_DIR
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.util import dt as dt_util
 
 from .api import GooglePhotosAPI
-from .const import DOMAIN
+from .const import (
+    CONF_ALBUM_ID,
+    CONF_INCLUDE_VIDEOS,
+    CONF_SLIDESHOW_INTERVAL,
+    CONF_SLIDESHOW_MODE,
+    CONF_UPDATE_INTERVAL,
+    DEFAULT_INCLUDE_VIDEOS,
+    DEFAULT_SLIDESHOW_INTERVAL,
+    DEFAULT_SLIDESHOW_MODE,
+    DEFAULT_UPDATE_INTERVAL,
+    DOMAIN,
+    PICKER_SCOPE,
+)
+from .coordinator import GooglePhotosCoordinator
+from .image_cache import ImageCache
+from .media_index import MediaIndex, scope_for_album
 from .options_flow import async_get_options_flow
+from .picker import PickerSessionManager
+from .services import async_setup_services, async_unload_services
+from .video_proxy import GooglePhotosVideoView, VideoProxy
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [Platform.CAMERA]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
 # Register options flow handler
 config_entries.HANDLERS.register(DOMAIN)(async_get_options_flow)
 
 
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Google Photos integration."""
+    hass.http.register_view(GooglePhotosVideoView(hass))
+    return True
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
     await async_unload_entry(hass, entry)
     await async_setup_entry(hass, entry)
 
 
+def _index_path(hass: HomeAssistant, entry: ConfigEntry) -> str:
+    """Return the path of the media index database for an entry."""
+    return hass.config.path(STORAGE_DIR, f"{DOMAIN}.{entry.entry_id}.db")
+
+
+def _image_cache_path(hass: HomeAssistant, entry: ConfigEntry) -> str:
+    """Return the offline image cache directory for an entry."""
+    return hass.config.path(STORAGE_DIR, f"{DOMAIN}.{entry.entry_id}.images")
+
+
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply updated options."""
+    coordinator: GooglePhotosCoordinator = hass.data[DOMAIN][entry.entry_id][
+        "coordinator"
+    ]
+    album_id = entry.options.get(CONF_ALBUM_ID) or entry.data.get(CONF_ALBUM_ID)
+    if (
+        album_id != coordinator.album_id
+        or entry.options.get(CONF_INCLUDE_VIDEOS, DEFAULT_INCLUDE_VIDEOS)
+        != coordinator.include_videos
+        or entry.options.get(CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL)
+        != coordinator.base_interval.total_seconds()
+    ):
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    # Mode and slideshow changes are answered from the index without a listing
+    coordinator.slideshow_interval = entry.options.get(
+        CONF_SLIDESHOW_INTERVAL, DEFAULT_SLIDESHOW_INTERVAL
+    )
+    mode = entry.options.get(CONF_SLIDESHOW_MODE, DEFAULT_SLIDESHOW_MODE)
+    if mode != coordinator.slideshow_mode:
+        await coordinator.async_set_slideshow_mode(mode)
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Google Photos from a config entry."""
     hass.data.setdefault(DOMAIN, {})
@@ -50,7 +118,64 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         _LOGGER.error("Unable to connect to Google Photos: %s", err)
         raise ConfigEntryNotReady from err
 
-    hass.data[DOMAIN][entry.entry_id] = api
+    album_id = entry.options.get(CONF_ALBUM_ID) or entry.data.get(CONF_ALBUM_ID)
+    update_interval = entry.options.get(
+        CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL
+    )
+    slideshow_interval = entry.options.get(
+        CONF_SLIDESHOW_INTERVAL, DEFAULT_SLIDESHOW_INTERVAL
+    )
+    slideshow_mode = entry.options.get(CONF_SLIDESHOW_MODE, DEFAULT_SLIDESHOW_MODE)
+    include_videos = entry.options.get(CONF_INCLUDE_VIDEOS, DEFAULT_INCLUDE_VIDEOS)
+
+    index = MediaIndex(_index_path(hass, entry), dt_util.get_default_time_zone())
+    await hass.async_add_executor_job(index.open)
+    # Drop items indexed for a previously configured album
+    await hass.async_add_executor_job(
+        index.retain_scopes, {scope_for_album(album_id), PICKER_SCOPE}
+    )
+    image_cache = ImageCache(_image_cache_path(hass, entry))
+    await hass.async_add_executor_job(image_cache.open)
+
+    coordinator = GooglePhotosCoordinator(
+        hass,
+        api,
+        index,
+        image_cache,
+        album_id,
+        update_interval,
+        slideshow_interval,
+        slideshow_mode,
+        include_videos,
+    )
+
+    # Fetch initial data
+    try:
+        await coordinator.async_config_entry_first_refresh()
+    except ConfigEntryNotReady:
+        await hass.async_add_executor_job(index.close)
+        raise
+
+    hass.data[DOMAIN][entry.entry_id] = {
+        "api": api,
+        "coordinator": coordinator,
+        "picker": PickerSessionManager(hass, coordinator),
+        "video_proxy": VideoProxy(hass, entry.entry_id),
+    }
+
+    async_setup_services(hass)
+
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
+
+    # on_this_day and last_30_days move on at midnight without a refresh
+    entry.async_on_unload(
+        async_track_time_change(
+            hass, coordinator.async_reload_slideshow, hour=0, minute=0, second=0
+        )
+    )
+
+    # The slideshow re-warms the offline cache as it advances; start it now
+    coordinator.async_schedule_warm_cache()
 
     # Forward the setup to the camera platform
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -62,7 +187,27 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        data = hass.data[DOMAIN].pop(entry.entry_id)
+        await data["picker"].async_shutdown()
+        await data["coordinator"].async_shutdown()
+        await hass.async_add_executor_job(data["coordinator"].index.close)
+        if not hass.data[DOMAIN]:
+            async_unload_services(hass)
 
     return unload_ok
 
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the media index and image cache when an entry is deleted."""
+    path = _index_path(hass, entry)
+
+    cache_path = _image_cache_path(hass, entry)
+
+    def _remove() -> None:
+        for suffix in ("", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+        shutil.rmtree(cache_path, ignore_errors=True)
+
+    await hass.async_add_executor_job(_remove)
+
@@ -2,10 +2,12 @@
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
 from datetime import datetime, timedelta
-from typing import Any
+from typing import Any, AsyncIterator
 
+from google.auth.exceptions import TransportError
 from google.auth.transport.requests import Request
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import Flow
@@ -16,10 +18,14 @@ from homeassistant.helpers.aiohttp_client import async_get_clientsession
 
 from .const import (
     PICKER_API_BASE,
+    PICKER_MEDIA_ITEMS_ENDPOINT,
+    PICKER_PAGE_SIZE,
     PICKER_POLL_ENDPOINT,
     PICKER_SESSION_ENDPOINT,
     SCOPES,
 )
+from .exceptions import GooglePhotosApiError, GooglePhotosUnavailableError
+from .tracing import RefreshTrace, maybe_span
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -34,9 +40,11 @@ class GooglePhotosAPI:
         refresh_token: str | None,
         client_id: str,
         client_secret: str,
+        api_base: str = PICKER_API_BASE,
     ) -> None:
         """Initialize the API client."""
         self.hass = hass
+        self.api_base = api_base
         self.client_id = client_id
         self.client_secret = client_secret
         self._session: aiohttp.ClientSession | None = None
@@ -65,7 +73,7 @@ class GooglePhotosAPI:
             _LOGGER.error("Failed to verify access: %s", err)
             return False
 
-    async def _ensure_valid_token(self) -> None:
+    async def _ensure_valid_token(self, trace: RefreshTrace | None = None) -> None:
         """Ensure we have a valid access token."""
         if self._credentials is None:
             raise ValueError("No credentials available")
@@ -76,7 +84,15 @@ class GooglePhotosAPI:
             or datetime.now() + timedelta(minutes=5) >= self._token_expiry
         ):
             # Refresh the token
-            await self.hass.async_add_executor_job(self._credentials.refresh, Request())
+            with maybe_span(trace, "token_refresh"):
+                try:
+                    await self.hass.async_add_executor_job(
+                        self._credentials.refresh, Request()
+                    )
+                except TransportError as err:
+                    raise GooglePhotosUnavailableError(
+                        f"Unable to reach Google to refresh the token: {err}"
+                    ) from err
             self._token_expiry = datetime.now() + timedelta(seconds=3600)
 
         self._access_token = self._credentials.token
@@ -109,7 +125,9 @@ class GooglePhotosAPI:
         ) as response:
             if response.status != 200:
                 error_text = await response.text()
-                raise Exception(f"Failed to create picker session: {error_text}")
+                raise GooglePhotosApiError(
+                    response.status, f"Failed to create picker session: {error_text}"
+                )
 
             return await response.json()
 
@@ -130,12 +148,16 @@ class GooglePhotosAPI:
         ) as response:
             if response.status != 200:
                 error_text = await response.text()
-                raise Exception(f"Failed to poll picker session: {error_text}")
+                raise GooglePhotosApiError(
+                    response.status, f"Failed to poll picker session: {error_text}"
+                )
 
             return await response.json()
 
-    async def async_get_media_items(self, media_item_ids: list[str]) -> list[dict[str, Any]]:
-        """Get media items by their IDs."""
+    async def async_iter_picked_media_item_pages(
+        self, session_id: str, page_size: int = PICKER_PAGE_SIZE
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Yield the items picked in a session one page at a time."""
         await self._ensure_valid_token()
 
         session = async_get_clientsession(self.hass)
@@ -144,23 +166,88 @@ class GooglePhotosAPI:
             "Content-Type": "application/json",
         }
 
+        page_token = None
+
+        while True:
+            params: dict[str, Any] = {"sessionId": session_id, "pageSize": page_size}
+            if page_token:
+                params["pageToken"] = page_token
+
+            async with session.get(
+                PICKER_MEDIA_ITEMS_ENDPOINT, headers=headers, params=params
+            ) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    raise GooglePhotosApiError(
+                        response.status, f"Failed to list picked items: {error_text}"
+                    )
+
+                data = await response.json()
+
+            if items := data.get("mediaItems", []):
+                yield items
+
+            page_token = data.get("nextPageToken")
+            if not page_token:
+                break
+
+    async def async_get_media_items(
+        self, media_item_ids: list[str], trace: RefreshTrace | None = None
+    ) -> list[dict[str, Any]]:
+        """Get media items by their IDs."""
+        await self._ensure_valid_token(trace)
+
+        session = async_get_clientsession(self.hass)
+        headers = {
+            "Authorization": f"Bearer {self._access_token}",
+            "Content-Type": "application/json",
+        }
+
         payload = {"mediaItemIds": media_item_ids}
 
-        async with session.post(
-            f"{PICKER_API_BASE}/mediaItems:batchGet",
-            headers=headers,
-            json=payload,
+        with maybe_span(trace, "batch_get", items=len(media_item_ids)):
+            async with session.post(
+                f"{self.api_base}/mediaItems:batchGet",
+                headers=headers,
+                json=payload,
+            ) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    raise GooglePhotosApiError(
+                        response.status, f"Failed to get media items: {error_text}"
+                    )
+
+                data = await response.json()
+                return data.get("mediaItemResults", [])
+
+    async def async_get_album(
+        self, album_id: str, trace: RefreshTrace | None = None
+    ) -> dict[str, Any]:
+        """Get a single album, including its title and item count."""
+        await self._ensure_valid_token(trace)
+
+        session = async_get_clientsession(self.hass)
+        headers = {
+            "Authorization": f"Bearer {self._access_token}",
+            "Content-Type": "application/json",
+        }
+
+        async with session.get(
+            f"{self.api_base}/albums/{album_id}", headers=headers
         ) as response:
             if response.status != 200:
                 error_text = await response.text()
-                raise Exception(f"Failed to get media items: {error_text}")
+                raise GooglePhotosApiError(
+                    response.status, f"Failed to get album: {error_text}"
+                )
 
-            data = await response.json()
-            return data.get("mediaItemResults", [])
+            return await response.json()
 
-    async def async_list_albums(self) -> list[dict[str, Any]]:
+    async def async_list_albums(
+        self, trace: RefreshTrace | None = None
+    ) -> list[dict[str, Any]]:
         """List all albums."""
-        await self._ensure_valid_token()
+        await self._ensure_valid_token(trace)
 
         session = async_get_clientsession(self.hass)
         headers = {
@@ -170,31 +257,65 @@ class GooglePhotosAPI:
 
         albums = []
         page_token = None
+        page = 0
 
         while True:
-            url = f"{PICKER_API_BASE}/albums"
+            url = f"{self.api_base}/albums"
             if page_token:
                 url += f"?pageToken={page_token}"
 
-            async with session.get(url, headers=headers) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    raise Exception(f"Failed to list albums: {error_text}")
+            with maybe_span(trace, "albums_page", page=page) as span:
+                async with session.get(url, headers=headers) as response:
+                    if response.status != 200:
+                        error_text = await response.text()
+                        raise GooglePhotosApiError(
+                            response.status, f"Failed to list albums: {error_text}"
+                        )
 
-                data = await response.json()
-                albums.extend(data.get("albums", []))
+                    body = await response.read()
+
+                data = json.loads(body)
+                page_albums = data.get("albums", [])
+                albums.extend(page_albums)
                 page_token = data.get("nextPageToken")
+                if span is not None:
+                    span.attributes.update(items=len(page_albums), bytes=len(body))
 
-                if not page_token:
-                    break
+            page += 1
+            if not page_token:
+                break
 
         return albums
 
     async def async_list_media_items(
-        self, album_id: str | None = None, page_size: int = 50
+        self,
+        album_id: str | None = None,
+        page_size: int = 50,
+        trace: RefreshTrace | None = None,
+        media_types: list[str] | None = None,
     ) -> list[dict[str, Any]]:
         """List media items, optionally from a specific album."""
-        await self._ensure_valid_token()
+        media_items = []
+        async for items in self.async_iter_media_item_pages(
+            album_id, page_size, trace, media_types
+        ):
+            media_items.extend(items)
+
+        return media_items
+
+    async def async_iter_media_item_pages(
+        self,
+        album_id: str | None = None,
+        page_size: int = 50,
+        trace: RefreshTrace | None = None,
+        media_types: list[str] | None = None,
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Yield media items one listing page at a time.
+
+        Library listings are limited to `media_types`, photos by default.
+        Album listings always include every item in the album.
+        """
+        await self._ensure_valid_token(trace)
 
         session = async_get_clientsession(self.hass)
         headers = {
@@ -202,8 +323,8 @@ class GooglePhotosAPI:
             "Content-Type": "application/json",
         }
 
-        media_items = []
         page_token = None
+        page = 0
 
         while True:
             payload: dict[str, Any] = {"pageSize": page_size}
@@ -217,30 +338,37 @@ class GooglePhotosAPI:
                 # For all photos, use filters to get all media items
                 payload["filters"] = {
                     "mediaTypeFilter": {
-                        "mediaTypes": ["PHOTO"]
+                        "mediaTypes": media_types or ["PHOTO"]
                     }
                 }
 
-            async with session.post(
-                f"{PICKER_API_BASE}/mediaItems:search",
-                headers=headers,
-                json=payload,
-            ) as response:
-                if response.status != 200:
-                    error_text = await response.text()
-                    _LOGGER.error("Failed to list media items: %s", error_text)
-                    raise Exception(f"Failed to list media items: {error_text}")
-
-                data = await response.json()
+            with maybe_span(trace, "media_page", page=page) as span:
+                async with session.post(
+                    f"{self.api_base}/mediaItems:search",
+                    headers=headers,
+                    json=payload,
+                ) as response:
+                    if response.status != 200:
+                        error_text = await response.text()
+                        _LOGGER.error("Failed to list media items: %s", error_text)
+                        raise GooglePhotosApiError(
+                            response.status, f"Failed to list media items: {error_text}"
+                        )
+
+                    body = await response.read()
+
+                data = json.loads(body)
                 items = data.get("mediaItems", [])
-                if items:
-                    media_items.extend(items)
                 page_token = data.get("nextPageToken")
+                if span is not None:
+                    span.attributes.update(items=len(items), bytes=len(body))
 
-                if not page_token:
-                    break
+            if items:
+                yield items
 
-        return media_items
+            page += 1
+            if not page_token:
+                break
 
     def get_credentials(self) -> Credentials | None:
         """Get the current credentials."""
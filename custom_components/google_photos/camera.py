@@ -8,156 +8,62 @@ from typing import Any
 
 import aiohttp
 
-from homeassistant.components.camera import Camera
+from homeassistant.components.camera import Camera, CameraEntityFeature
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.helpers.network import NoURLAvailableError, get_url
 
-from .api import GooglePhotosAPI
 from .const import (
     ATTR_ALBUM_NAME,
     ATTR_CURRENT_PHOTO,
+    ATTR_OFFLINE,
     ATTR_PHOTO_COUNT,
     ATTR_PHOTO_URL,
-    CONF_ALBUM_ID,
-    CONF_SLIDESHOW_INTERVAL,
-    CONF_UPDATE_INTERVAL,
-    DEFAULT_SLIDESHOW_INTERVAL,
-    DEFAULT_UPDATE_INTERVAL,
     DOMAIN,
 )
+from .coordinator import GooglePhotosCoordinator
+from .video_proxy import VideoProxy
 
 _LOGGER = logging.getLogger(__name__)
 
 SCAN_INTERVAL = timedelta(seconds=30)
 
 
-class GooglePhotosCoordinator(DataUpdateCoordinator):
-    """Coordinator for Google Photos data."""
-
-    def __init__(
-        self,
-        hass: HomeAssistant,
-        api: GooglePhotosAPI,
-        album_id: str | None,
-        update_interval: int,
-        slideshow_interval: int,
-    ) -> None:
-        """Initialize the coordinator."""
-        super().__init__(
-            hass,
-            _LOGGER,
-            name=DOMAIN,
-            update_interval=timedelta(seconds=update_interval),
-        )
-        self.api = api
-        self.album_id = album_id
-        self.slideshow_interval = slideshow_interval
-        self.media_items: list[dict[str, Any]] = []
-        self.current_index = 0
-        self.album_name: str | None = None
-
-    async def _async_update_data(self) -> dict[str, Any]:
-        """Fetch data from Google Photos."""
-        try:
-            # Fetch media items
-            self.media_items = await self.api.async_list_media_items(self.album_id)
-
-            # Get album name if album_id is set
-            if self.album_id:
-                albums = await self.api.async_list_albums()
-                for album in albums:
-                    if album.get("id") == self.album_id:
-                        self.album_name = album.get("title", "Unknown Album")
-                        break
-
-            if not self.media_items:
-                _LOGGER.warning("No media items found")
-                return {
-                    "photo_url": None,
-                    "photo_count": 0,
-                    "current_index": 0,
-                    "album_name": self.album_name,
-                }
-
-            # Ensure current_index is within bounds
-            if self.current_index >= len(self.media_items):
-                self.current_index = 0
-
-            current_item = self.media_items[self.current_index]
-            photo_url = current_item.get("baseUrl", "")
-
-            # Add size parameter for better quality
-            if photo_url:
-                photo_url += "=w1920-h1080"
-
-            return {
-                "photo_url": photo_url,
-                "photo_count": len(self.media_items),
-                "current_index": self.current_index,
-                "album_name": self.album_name,
-            }
-        except Exception as err:
-            raise UpdateFailed(f"Error fetching Google Photos data: {err}") from err
-
-    def get_next_photo(self) -> dict[str, Any] | None:
-        """Get the next photo in the slideshow."""
-        if not self.media_items:
-            return None
-
-        self.current_index = (self.current_index + 1) % len(self.media_items)
-        current_item = self.media_items[self.current_index]
-        photo_url = current_item.get("baseUrl", "")
-
-        if photo_url:
-            photo_url += "=w1920-h1080"
-
-        return {
-            "photo_url": photo_url,
-            "photo_count": len(self.media_items),
-            "current_index": self.current_index,
-            "album_name": self.album_name,
-        }
-
-
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up Google Photos camera from a config entry."""
-    api: GooglePhotosAPI = hass.data[DOMAIN][entry.entry_id]
-
-    album_id = entry.options.get(CONF_ALBUM_ID) or entry.data.get(CONF_ALBUM_ID)
-    update_interval = entry.options.get(
-        CONF_UPDATE_INTERVAL, DEFAULT_UPDATE_INTERVAL
-    )
-    slideshow_interval = entry.options.get(
-        CONF_SLIDESHOW_INTERVAL, DEFAULT_SLIDESHOW_INTERVAL
+    entry_data = hass.data[DOMAIN][entry.entry_id]
+
+    async_add_entities(
+        [
+            GooglePhotosCamera(
+                entry_data["coordinator"], entry_data["video_proxy"], entry
+            )
+        ]
     )
 
-    coordinator = GooglePhotosCoordinator(
-        hass, api, album_id, update_interval, slideshow_interval
-    )
-
-    # Fetch initial data
-    await coordinator.async_config_entry_first_refresh()
-
-    async_add_entities([GooglePhotosCamera(coordinator, entry)])
-
 
 class GooglePhotosCamera(Camera):
     """Representation of a Google Photos camera."""
 
     def __init__(
-        self, coordinator: GooglePhotosCoordinator, entry: ConfigEntry
+        self,
+        coordinator: GooglePhotosCoordinator,
+        video_proxy: VideoProxy,
+        entry: ConfigEntry,
     ) -> None:
         """Initialize the camera."""
         super().__init__()
         self.coordinator = coordinator
+        self._video_proxy = video_proxy
         self._entry = entry
         self._slideshow_task: asyncio.Task | None = None
+        self._stream_item_id: str | None = None
         self._attr_name = "Google Photos"
         self._attr_unique_id = f"{entry.entry_id}_camera"
 
@@ -181,17 +87,37 @@ class GooglePhotosCamera(Camera):
 
     def _handle_coordinator_update(self) -> None:
         """Handle updated data from the coordinator."""
+        self._update_stream()
         self.async_write_ha_state()
 
+    def _update_stream(self) -> None:
+        """Point an open stream at the current video, or stop it.
+
+        Home Assistant asks for the stream source only when it creates the
+        stream, so later video slides have to be switched here.
+        """
+        if self.stream is None:
+            return
+
+        item = self.coordinator.get_current_item()
+        if item is None or item.get("mediaType") != "VIDEO" or self.coordinator.offline:
+            stream, self.stream = self.stream, None
+            self._stream_item_id = None
+            self.hass.async_create_task(stream.stop())
+            return
+
+        if item["id"] == self._stream_item_id:
+            # Keep the proxy on the latest base URL for the playing video
+            self._video_proxy.url_for(item)
+        elif (source := self._video_source(item)) is not None:
+            self.stream.update_source(source)
+
     async def _slideshow_loop(self) -> None:
         """Loop to advance slideshow."""
         while True:
             try:
                 await asyncio.sleep(self.coordinator.slideshow_interval)
-                if self.coordinator.media_items:
-                    next_photo = self.coordinator.get_next_photo()
-                    if next_photo:
-                        self.coordinator.async_set_updated_data(next_photo)
+                await self.coordinator.async_advance_slide()
             except asyncio.CancelledError:
                 break
             except Exception as err:
@@ -203,20 +129,59 @@ class GooglePhotosCamera(Camera):
     ) -> bytes | None:
         """Return bytes of camera image."""
         data = self.coordinator.data
-        photo_url = data.get("photo_url")
 
-        if not photo_url:
+        # Serve warmed slides locally, which also keeps working offline
+        cached = await self.coordinator.async_get_cached_image(data.get("item_id"))
+        if cached is not None:
+            return cached
+
+        photo_url = data.get("photo_url")
+        if not photo_url or self.coordinator.offline:
             return None
 
         try:
-            session = self.hass.helpers.aiohttp_client.async_get_clientsession()
+            session = async_get_clientsession(self.hass)
             async with session.get(photo_url, timeout=aiohttp.ClientTimeout(total=10)) as response:
                 if response.status == 200:
                     return await response.read()
+                error: Exception | str = f"HTTP {response.status}"
         except Exception as err:
             _LOGGER.error("Error fetching photo: %s", err)
+            error = err
 
-        return None
+        # Fresh URLs or offline mode may move the slideshow to a cached slide
+        await self.coordinator.async_handle_image_error(error)
+        return await self.coordinator.async_get_cached_image(
+            self.coordinator.data.get("item_id")
+        )
+
+    @property
+    def supported_features(self) -> CameraEntityFeature:
+        """Offer a stream while the current slide is a video."""
+        if self.coordinator.data.get("media_type") == "VIDEO":
+            return CameraEntityFeature.STREAM
+        return CameraEntityFeature(0)
+
+    async def stream_source(self) -> str | None:
+        """Return the local proxy URL for the current video slide."""
+        item = self.coordinator.get_current_item()
+        if (
+            item is None
+            or item.get("mediaType") != "VIDEO"
+            or self.coordinator.offline
+        ):
+            return None
+        return self._video_source(item)
+
+    def _video_source(self, item: dict[str, Any]) -> str | None:
+        """Register a video with the proxy and return its local URL."""
+        try:
+            base_url = get_url(self.hass, allow_external=False)
+        except NoURLAvailableError:
+            _LOGGER.error("No internal URL available to stream video from")
+            return None
+        self._stream_item_id = item["id"]
+        return base_url + self._video_proxy.url_for(item)
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
@@ -227,5 +192,6 @@ class GooglePhotosCamera(Camera):
             ATTR_CURRENT_PHOTO: data.get("current_index", 0) + 1,
             ATTR_ALBUM_NAME: data.get("album_name"),
             ATTR_PHOTO_URL: data.get("photo_url"),
+            ATTR_OFFLINE: data.get("offline", False),
         }
 
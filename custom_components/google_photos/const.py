@@ -13,6 +13,7 @@ SCOPES = [
 PICKER_API_BASE = "https://photoslibrary.googleapis.com/v1"
 PICKER_SESSION_ENDPOINT = f"{PICKER_API_BASE}/picker:createSession"
 PICKER_POLL_ENDPOINT = f"{PICKER_API_BASE}/picker:poll"
+PICKER_MEDIA_ITEMS_ENDPOINT = f"{PICKER_API_BASE}/picker:listMediaItems"
 OAUTH_TOKEN_URI = "https://oauth2.googleapis.com/token"
 OAUTH_AUTH_URI = "https://accounts.google.com/o/oauth2/v2/auth"
 
@@ -22,14 +23,79 @@ CONF_CLIENT_SECRET = "client_secret"
 CONF_ALBUM_ID = "album_id"
 CONF_UPDATE_INTERVAL = "update_interval"
 CONF_SLIDESHOW_INTERVAL = "slideshow_interval"
+CONF_SLIDESHOW_MODE = "slideshow_mode"
+CONF_INCLUDE_VIDEOS = "include_videos"
+
+# Slideshow modes, answered from the local media index
+SLIDESHOW_MODE_ALL = "all"
+SLIDESHOW_MODE_ON_THIS_DAY = "on_this_day"
+SLIDESHOW_MODE_LAST_30_DAYS = "last_30_days"
+SLIDESHOW_MODE_LANDSCAPE = "landscape"
+SLIDESHOW_MODE_PORTRAIT = "portrait"
+SLIDESHOW_MODE_PICKED = "picked"
+SLIDESHOW_MODES = [
+    SLIDESHOW_MODE_ALL,
+    SLIDESHOW_MODE_ON_THIS_DAY,
+    SLIDESHOW_MODE_LAST_30_DAYS,
+    SLIDESHOW_MODE_LANDSCAPE,
+    SLIDESHOW_MODE_PORTRAIT,
+    SLIDESHOW_MODE_PICKED,
+]
+
+# Media index scopes used when no album is configured and for picked items
+LIBRARY_SCOPE = ""
+PICKER_SCOPE = "picker"
 
 # Defaults
 DEFAULT_UPDATE_INTERVAL = 3600  # 1 hour
 DEFAULT_SLIDESHOW_INTERVAL = 10  # 10 seconds
+DEFAULT_SLIDESHOW_MODE = SLIDESHOW_MODE_ALL
+DEFAULT_INCLUDE_VIDEOS = False
+
+# Adaptive refresh scheduling
+ADAPTIVE_MIN_INTERVAL = 300  # 5 minutes
+ADAPTIVE_MAX_INTERVAL = 21600  # 6 hours
+FULL_SYNC_MAX_AGE = 86400  # 1 day, catches deletions the fingerprint misses
+FINGERPRINT_PAGE_SIZE = 25
+
+# Base URLs expire after 60 minutes; refresh them a little early
+BASE_URL_TTL = 3000  # 50 minutes
+BATCH_GET_LIMIT = 50
+
+# Slides held in memory at a time; the rest stay in the media index
+SLIDESHOW_WINDOW_SIZE = 100
+
+# Size requested for slides
+PHOTO_SIZE = "=w1920-h1080"
+
+# Offline playback cache, re-warmed each time the slideshow has used up
+# half of the cached slides
+OFFLINE_CACHE_SIZE = 200
+CACHE_REWARM_SLIDES = OFFLINE_CACHE_SIZE // 2
+CACHE_WARM_CONCURRENCY = 4
+
+# Picker session polling, used when the server gives no recommendation
+PICKER_DEFAULT_POLL_INTERVAL = 5
+PICKER_DEFAULT_TIMEOUT = 1800
+PICKER_MAX_POLL_INTERVAL = 60
+PICKER_INGEST_CONCURRENCY = 4
+PICKER_PAGE_SIZE = 100
+
+# Video proxy segment cache
+VIDEO_SEGMENT_SIZE = 1024 * 1024  # 1 MiB
+VIDEO_CACHE_MAX_BYTES = 64 * 1024 * 1024  # 64 MiB
+VIDEO_PROXY_MAX_SOURCES = 16
 
 # Attributes
 ATTR_ALBUM_NAME = "album_name"
 ATTR_PHOTO_COUNT = "photo_count"
 ATTR_CURRENT_PHOTO = "current_photo"
 ATTR_PHOTO_URL = "photo_url"
+ATTR_OFFLINE = "offline"
+
 
+# Services
+SERVICE_PROFILE_REFRESH = "profile_refresh"
+SERVICE_PICK_PHOTOS = "pick_photos"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_COUNT = "count"
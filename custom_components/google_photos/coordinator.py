@@ -0,0 +1,578 @@
+"""Data update coordinator for Google Photos."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from contextlib import aclosing
+from datetime import datetime, timedelta
+import hashlib
+import logging
+import time
+from typing import Any
+
+import aiohttp
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .api import GooglePhotosAPI
+from .const import (
+    ADAPTIVE_MIN_INTERVAL,
+    BASE_URL_TTL,
+    BATCH_GET_LIMIT,
+    CACHE_REWARM_SLIDES,
+    CACHE_WARM_CONCURRENCY,
+    DOMAIN,
+    FINGERPRINT_PAGE_SIZE,
+    OFFLINE_CACHE_SIZE,
+    PHOTO_SIZE,
+    SLIDESHOW_WINDOW_SIZE,
+)
+from .image_cache import ImageCache
+from .exceptions import is_unavailable
+from .media_index import (
+    MediaIndex,
+    SlideKey,
+    scope_for_album,
+    scope_for_mode,
+    slide_key,
+)
+from .scheduling import adaptive_interval, needs_full_sync
+from .tracing import RefreshProfiler, RefreshTrace
+
+_LOGGER = logging.getLogger(__name__)
+
+# Number of refresh traces kept for diagnostics
+TRACE_HISTORY = 10
+
+
+class GooglePhotosCoordinator(DataUpdateCoordinator):
+    """Coordinator for Google Photos data."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        api: GooglePhotosAPI,
+        index: MediaIndex,
+        image_cache: ImageCache,
+        album_id: str | None,
+        update_interval: int,
+        slideshow_interval: int,
+        slideshow_mode: str,
+        include_videos: bool,
+    ) -> None:
+        """Initialize the coordinator."""
+        super().__init__(
+            hass,
+            _LOGGER,
+            name=DOMAIN,
+            update_interval=timedelta(seconds=update_interval),
+        )
+        self.api = api
+        self.index = index
+        self.image_cache = image_cache
+        self.base_interval = timedelta(seconds=update_interval)
+        self.album_id = album_id
+        self.slideshow_interval = slideshow_interval
+        self.slideshow_mode = slideshow_mode
+        self.include_videos = include_videos
+        # Only a window of the slideshow is held in memory, starting at
+        # position window_start; photo_count is the length of the slideshow
+        self.media_items: list[dict[str, Any]] = []
+        self.window_start = 0
+        self.photo_count = 0
+        self.current_index = 0
+        self.album_name: str | None = None
+        self.traces: deque[RefreshTrace] = deque(maxlen=TRACE_HISTORY)
+        self.profiler = RefreshProfiler()
+        self.fingerprint: str | None = None
+        self.last_full_sync: datetime | None = None
+        self.sync_stats = {"checks": 0, "full_syncs": 0, "skipped": 0}
+        self.cache_stats = {"warm_downloads": 0}
+        self.offline = False
+        self._slides_since_warm = 0
+        self._warm_task: asyncio.Task | None = None
+        self._image_error_lock = asyncio.Lock()
+        self._image_error_item: str | None = None
+
+    async def async_shutdown(self) -> None:
+        """Cancel background cache warming."""
+        await super().async_shutdown()
+        if self._warm_task is not None:
+            self._warm_task.cancel()
+
+    async def _async_update_data(self) -> dict[str, Any]:
+        """Fetch data from Google Photos."""
+        trace = RefreshTrace()
+        profile = self.profiler.start()
+        error: Exception | None = None
+        try:
+            data = await self._async_fetch_data(trace)
+        except Exception as err:
+            error = err
+            # Offline playback bridges outages, not auth failures or bugs
+            if not is_unavailable(err) or not self.image_cache:
+                self.update_interval = timedelta(seconds=ADAPTIVE_MIN_INTERVAL)
+                raise UpdateFailed(
+                    f"Error fetching Google Photos data: {err}"
+                ) from err
+            return await self._async_go_offline(err)
+        finally:
+            trace.finish(error)
+            self.traces.append(trace)
+            if profile is not None:
+                self.profiler.stop(profile, trace)
+            _LOGGER.debug("Refresh trace: %s", trace.summary())
+
+        if self.offline:
+            _LOGGER.info("Google Photos is reachable again, leaving offline mode")
+            self.offline = False
+            await self._async_query_index()
+            data = self._current_data()
+        return data
+
+    async def _async_go_offline(self, err: Exception) -> dict[str, Any]:
+        """Play from the warmed image cache while Google is unreachable."""
+        if not self.offline:
+            _LOGGER.warning(
+                "Google Photos unavailable, playing %s cached photos: %s",
+                len(self.image_cache),
+                err,
+            )
+            self.offline = True
+            # The cached items are the whole slideshow while offline
+            self.media_items = await self.hass.async_add_executor_job(
+                self.index.items,
+                scope_for_mode(scope_for_album(self.album_id), self.slideshow_mode),
+                self.image_cache.item_ids(),
+                self.include_videos,
+            )
+            self.photo_count = len(self.media_items)
+            self.window_start = self.current_index = 0
+
+        # Check again soon so playback goes back online quickly
+        self.update_interval = timedelta(seconds=ADAPTIVE_MIN_INTERVAL)
+        return self._current_data()
+
+    async def _async_fetch_data(self, trace: RefreshTrace) -> dict[str, Any]:
+        """Fetch media items and album details, recording spans on `trace`.
+
+        A cheap fingerprint is checked first and the full listing is skipped
+        when nothing changed, unless the last full sync is too old. The
+        slideshow is re-queried from the index either way.
+        """
+        scope = scope_for_album(self.album_id)
+        if self.last_full_sync is None:
+            # Pick up where the last run left off instead of listing again
+            await self._async_load_sync_state(scope)
+
+        with trace.span("change_check") as span:
+            fingerprint = await self._async_fingerprint(trace)
+            changed = fingerprint != self.fingerprint
+            span.attributes["changed"] = changed
+        self.sync_stats["checks"] += 1
+
+        now = dt_util.utcnow()
+        if needs_full_sync(changed, self.last_full_sync, now):
+            await self._async_sync_index(trace)
+            self.fingerprint = fingerprint
+            self.last_full_sync = now
+            self.sync_stats["full_syncs"] += 1
+            await self.hass.async_add_executor_job(
+                self.index.set_sync_state, scope, fingerprint, int(now.timestamp())
+            )
+        else:
+            self.sync_stats["skipped"] += 1
+
+        # Date based modes move with the clock even when the library does not
+        with trace.span("query_index", mode=self.slideshow_mode) as span:
+            await self._async_query_index()
+            span.attributes["items"] = self.photo_count
+        # URLs read back from the index may have expired while skipping syncs
+        await self.async_refresh_expiring_urls()
+
+        self._schedule_next(changed)
+        return self._current_data()
+
+    async def _async_load_sync_state(self, scope: str) -> None:
+        """Restore the fingerprint and last full sync time from the index."""
+        fingerprint, synced_at = await self.hass.async_add_executor_job(
+            self.index.sync_state, scope
+        )
+        if fingerprint is None or synced_at is None:
+            return
+        self.fingerprint = fingerprint
+        self.last_full_sync = dt_util.utc_from_timestamp(synced_at)
+
+    async def _async_fingerprint(self, trace: RefreshTrace) -> str:
+        """Return a fingerprint of the newest page and album item count."""
+        digest = hashlib.sha1()
+        # Toggling videos changes what a full sync lists
+        digest.update(",".join(self._media_types).encode())
+        if self.album_id:
+            with trace.span("album_lookup"):
+                album = await self.api.async_get_album(self.album_id, trace=trace)
+            self.album_name = album.get("title", "Unknown Album")
+            digest.update(str(album.get("mediaItemsCount")).encode())
+
+        async with aclosing(
+            self.api.async_iter_media_item_pages(
+                self.album_id,
+                page_size=FINGERPRINT_PAGE_SIZE,
+                trace=trace,
+                media_types=self._media_types,
+            )
+        ) as pages:
+            async for items in pages:
+                for item in items:
+                    digest.update(item.get("id", "").encode())
+                break
+
+        return digest.hexdigest()
+
+    def _schedule_next(self, changed: bool) -> None:
+        """Tighten the interval after changes and back off while idle."""
+        seconds = adaptive_interval(
+            changed,
+            self.update_interval.total_seconds(),
+            self.base_interval.total_seconds(),
+        )
+        self.update_interval = timedelta(seconds=seconds)
+        _LOGGER.debug(
+            "Library %s, next check in %ss",
+            "changed" if changed else "unchanged",
+            int(seconds),
+        )
+
+    async def _async_sync_index(self, trace: RefreshTrace) -> None:
+        """List media items and write them to the index one page at a time."""
+        scope = scope_for_album(self.album_id)
+        sync_id = int(dt_util.utcnow().timestamp() * 1000)
+        with trace.span("sync_index") as span:
+            synced = 0
+            async for items in self.api.async_iter_media_item_pages(
+                self.album_id, trace=trace, media_types=self._media_types
+            ):
+                await self.hass.async_add_executor_job(
+                    self.index.add_items, items, scope, sync_id
+                )
+                synced += len(items)
+            removed = await self.hass.async_add_executor_job(
+                self.index.finish_sync, scope, sync_id
+            )
+            span.attributes.update(items=synced, removed=removed)
+
+    @property
+    def _media_types(self) -> list[str]:
+        """Return the media types listed from the library."""
+        return ["PHOTO", "VIDEO"] if self.include_videos else ["PHOTO"]
+
+    def _window(
+        self, limit: int, after: SlideKey | None = None, inclusive: bool = False
+    ) -> list[dict[str, Any]]:
+        """Return a window of the slideshow from the index."""
+        return self.index.window(
+            scope_for_album(self.album_id),
+            self.slideshow_mode,
+            self.include_videos,
+            dt_util.now(),
+            limit,
+            after=after,
+            inclusive=inclusive,
+        )
+
+    def _load_slideshow(
+        self, anchor: SlideKey | None
+    ) -> tuple[int, int, list[dict[str, Any]]]:
+        """Count the slideshow and load the window starting at `anchor`.
+
+        Returns the slideshow length, the window's position and the window.
+        """
+        scope = scope_for_album(self.album_id)
+        now = dt_util.now()
+        count = self.index.count(
+            scope, self.slideshow_mode, self.include_videos, now
+        )
+        if anchor is not None:
+            position = self.index.position(
+                scope, self.slideshow_mode, self.include_videos, now, anchor
+            )
+            if position < count:
+                window = self._window(SLIDESHOW_WINDOW_SIZE, anchor, inclusive=True)
+                return count, position, window
+        return count, 0, self._window(SLIDESHOW_WINDOW_SIZE)
+
+    async def _async_query_index(self, keep_position: bool = True) -> None:
+        """Reload the slideshow for the current album and mode from the index.
+
+        The slideshow stays at the current slide, or the one that took its
+        place, unless `keep_position` is False.
+        """
+        current = self.get_current_item()
+        anchor = slide_key(current) if keep_position and current else None
+        count, position, window = await self.hass.async_add_executor_job(
+            self._load_slideshow, anchor
+        )
+        self.photo_count = count
+        self.media_items = window
+        self.window_start = self.current_index = position
+
+    async def async_set_slideshow_mode(self, mode: str) -> None:
+        """Switch slideshow mode using the index, without a new listing."""
+        self.slideshow_mode = mode
+        await self._async_query_index(keep_position=False)
+        self.data = self._current_data()
+        self.async_update_listeners()
+
+    async def async_reload_slideshow(self, now: datetime | None = None) -> None:
+        """Re-query the slideshow when the local date changes."""
+        if self.offline:
+            return
+        await self._async_query_index()
+        self.data = self._current_data()
+        self.async_update_listeners()
+
+    async def async_refresh_expiring_urls(self) -> None:
+        """Refresh base URLs ahead of the slideshow before they expire.
+
+        Listings are skipped while the library is unchanged, so base URLs can
+        outlive their one hour validity. When the next slide's URL is stale,
+        the upcoming window of items is refreshed with a single batch get.
+        """
+        if self.offline or (item := self.get_current_item()) is None:
+            return
+
+        if item.get("fetchedAt", 0) >= time.time() - BASE_URL_TTL:
+            return
+
+        offset = self.current_index - self.window_start
+        window = self.media_items[offset : offset + BATCH_GET_LIMIT]
+        try:
+            await self._async_refresh_base_urls(window)
+        except Exception as err:
+            _LOGGER.warning("Unable to refresh photo URLs: %s", err)
+
+    async def _async_refresh_base_urls(self, items: list[dict[str, Any]]) -> None:
+        """Fetch new base URLs for `items` and store them in the index."""
+        for offset in range(0, len(items), BATCH_GET_LIMIT):
+            batch = items[offset : offset + BATCH_GET_LIMIT]
+            results = await self.api.async_get_media_items(
+                [item["id"] for item in batch]
+            )
+            fetched_at = int(time.time())
+            refreshed = {
+                result["mediaItem"]["id"]: result["mediaItem"]["baseUrl"]
+                for result in results
+                if "mediaItem" in result
+            }
+            for item in batch:
+                if item["id"] in refreshed:
+                    item["baseUrl"] = refreshed[item["id"]]
+                    item["fetchedAt"] = fetched_at
+
+            await self.hass.async_add_executor_job(
+                self.index.update_base_urls,
+                [item for item in batch if item["id"] in refreshed],
+                fetched_at,
+            )
+
+    def _upcoming(self, anchor: SlideKey | None, limit: int) -> list[dict[str, Any]]:
+        """Return up to `limit` slideshow items from `anchor`, wrapping around."""
+        items = self._window(limit, anchor, inclusive=True) if anchor else []
+        if len(items) < limit:
+            seen = {item["id"] for item in items}
+            items.extend(
+                item
+                for item in self._window(limit - len(items))
+                if item["id"] not in seen
+            )
+        return items
+
+    async def async_warm_cache(self) -> None:
+        """Download the upcoming window of slides for offline playback."""
+        if self.offline or (current := self.get_current_item()) is None:
+            return
+
+        window = await self.hass.async_add_executor_job(
+            self._upcoming, slide_key(current), OFFLINE_CACHE_SIZE
+        )
+        missing = [item for item in window if item["id"] not in self.image_cache]
+        _LOGGER.debug(
+            "Warming image cache: %s of %s upcoming photos missing",
+            len(missing),
+            len(window),
+        )
+        if missing:
+            await self._async_refresh_base_urls(missing)
+
+        session = async_get_clientsession(self.hass)
+        semaphore = asyncio.Semaphore(CACHE_WARM_CONCURRENCY)
+
+        async def _async_download(item: dict[str, Any]) -> None:
+            """Download one slide into the cache."""
+            async with semaphore:
+                self.cache_stats["warm_downloads"] += 1
+                try:
+                    async with session.get(
+                        item["baseUrl"] + PHOTO_SIZE,
+                        timeout=aiohttp.ClientTimeout(total=30),
+                    ) as response:
+                        if response.status != 200:
+                            return
+                        data = await response.read()
+                except (aiohttp.ClientError, asyncio.TimeoutError) as err:
+                    _LOGGER.debug("Unable to cache photo %s: %s", item["id"], err)
+                    return
+            await self.hass.async_add_executor_job(
+                self.image_cache.put, item["id"], data
+            )
+
+        await asyncio.gather(*(_async_download(item) for item in missing))
+        removed = await self.hass.async_add_executor_job(
+            self.image_cache.prune, [item["id"] for item in window]
+        )
+        _LOGGER.debug(
+            "Image cache holds %s photos, removed %s", len(self.image_cache), removed
+        )
+
+    @callback
+    def async_schedule_warm_cache(self) -> None:
+        """Warm the image cache in the background unless already warming."""
+        if self._warm_task is not None and not self._warm_task.done():
+            return
+        self._slides_since_warm = 0
+        self._warm_task = self.hass.async_create_background_task(
+            self._async_try_warm_cache(), f"{DOMAIN}_warm_cache"
+        )
+
+    async def _async_try_warm_cache(self) -> None:
+        """Warm the image cache, logging failures."""
+        try:
+            await self.async_warm_cache()
+        except Exception as err:
+            _LOGGER.warning("Unable to warm the image cache: %s", err)
+
+    async def async_handle_image_error(self, err: Exception | str) -> None:
+        """React to a slide that could not be fetched from Google.
+
+        The slide's URL may have expired, so the upcoming URLs are refreshed
+        first. If that fails too, a refresh is requested right away rather
+        than at the next scheduled check, which may be hours off; when
+        Google is unreachable it switches the slideshow to the image cache.
+        """
+        if self.offline or self._image_error_lock.locked():
+            return
+        async with self._image_error_lock:
+            item = self.get_current_item()
+            # Handle each slide once, however many viewers hit the error
+            if item is None or item["id"] == self._image_error_item:
+                return
+            self._image_error_item = item["id"]
+            _LOGGER.debug("Unable to fetch slide %s: %s", item["id"], err)
+            offset = self.current_index - self.window_start
+            try:
+                await self._async_refresh_base_urls(
+                    self.media_items[offset : offset + BATCH_GET_LIMIT]
+                )
+            except Exception as refresh_err:
+                _LOGGER.debug("Unable to refresh photo URLs: %s", refresh_err)
+                await self.async_request_refresh()
+                return
+            self.data = self._current_data()
+            self.async_update_listeners()
+
+    async def async_get_cached_image(self, item_id: str | None) -> bytes | None:
+        """Return the cached image for an item, if any."""
+        if item_id is None or item_id not in self.image_cache:
+            return None
+        return await self.hass.async_add_executor_job(self.image_cache.get, item_id)
+
+    async def async_advance_slide(self) -> None:
+        """Advance the slideshow without rescheduling the next refresh.
+
+        The next window of slides is loaded from the index when the current
+        one runs out, and the base URLs ahead are refreshed if they expired.
+        """
+        if not self.photo_count:
+            return
+
+        next_index = self.current_index + 1
+        if next_index - self.window_start < len(self.media_items):
+            self.current_index = next_index
+        else:
+            await self._async_load_next_window(next_index)
+        await self.async_refresh_expiring_urls()
+
+        # async_set_updated_data would push the refresh back on every slide
+        self.data = self._current_data()
+        self.async_update_listeners()
+
+        # Keep the cache ahead of the slideshow for offline playback
+        self._slides_since_warm += 1
+        if self._slides_since_warm >= CACHE_REWARM_SLIDES and not self.offline:
+            self.async_schedule_warm_cache()
+
+    async def _async_load_next_window(self, next_index: int) -> None:
+        """Load the window starting at slide `next_index`, wrapping around."""
+        items = self.media_items
+        window: list[dict[str, Any]] = []
+        if self.offline:
+            # The offline window already holds every playable slide
+            window, next_index = items, 0
+        else:
+            if next_index < self.photo_count and items:
+                window = await self.hass.async_add_executor_job(
+                    self._window, SLIDESHOW_WINDOW_SIZE, slide_key(items[-1])
+                )
+            if not window:
+                window = await self.hass.async_add_executor_job(
+                    self._window, SLIDESHOW_WINDOW_SIZE
+                )
+                next_index = 0
+
+        if self.media_items is not items:
+            # The slideshow was reloaded while the window was being read
+            return
+        self.media_items = window
+        self.window_start = self.current_index = next_index
+        if not window:
+            self.photo_count = 0
+
+    def _current_data(self) -> dict[str, Any]:
+        """Return coordinator data for the current slide."""
+        if (current_item := self.get_current_item()) is None:
+            _LOGGER.warning("No media items found")
+            return {
+                "item_id": None,
+                "media_type": None,
+                "photo_url": None,
+                "photo_count": 0,
+                "current_index": 0,
+                "album_name": self.album_name,
+                "offline": self.offline,
+            }
+
+        photo_url = current_item.get("baseUrl", "")
+
+        # Add size parameter for better quality
+        if photo_url:
+            photo_url += PHOTO_SIZE
+
+        return {
+            "item_id": current_item.get("id"),
+            "media_type": current_item.get("mediaType", "PHOTO"),
+            "photo_url": photo_url,
+            "photo_count": self.photo_count,
+            "current_index": self.current_index,
+            "album_name": self.album_name,
+            "offline": self.offline,
+        }
+
+    def get_current_item(self) -> dict[str, Any] | None:
+        """Return the media item for the current slide."""
+        offset = self.current_index - self.window_start
+        if not 0 <= offset < len(self.media_items):
+            return None
+        return self.media_items[offset]
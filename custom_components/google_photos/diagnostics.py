@@ -0,0 +1,45 @@
+"""Diagnostics support for Google Photos."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import CONF_CLIENT_SECRET, DOMAIN
+from .coordinator import GooglePhotosCoordinator
+
+TO_REDACT = {CONF_CLIENT_SECRET, "token"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: GooglePhotosCoordinator = hass.data[DOMAIN][entry.entry_id][
+        "coordinator"
+    ]
+
+    return {
+        "entry": {
+            "data": async_redact_data(dict(entry.data), TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "coordinator": {
+            "album_id": coordinator.album_id,
+            "photo_count": coordinator.photo_count,
+            "current_index": coordinator.current_index,
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": coordinator.update_interval.total_seconds(),
+            "last_full_sync": (
+                coordinator.last_full_sync.isoformat()
+                if coordinator.last_full_sync
+                else None
+            ),
+            "sync_stats": coordinator.sync_stats,
+            "cache_stats": coordinator.cache_stats,
+        },
+        "refresh_traces": [trace.as_dict() for trace in coordinator.traces],
+        "profiles": coordinator.profiler.results,
+    }
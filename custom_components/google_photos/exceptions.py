@@ -0,0 +1,39 @@
+"""Exceptions for the Google Photos integration."""
+from __future__ import annotations
+
+import asyncio
+from http import HTTPStatus
+
+import aiohttp
+
+
+class GooglePhotosApiError(Exception):
+    """Google answered a request with an error status."""
+
+    def __init__(self, status: int, message: str) -> None:
+        """Initialize the error."""
+        super().__init__(message)
+        self.status = status
+
+
+class GooglePhotosUnavailableError(Exception):
+    """Google could not be reached."""
+
+
+def is_unavailable(err: BaseException) -> bool:
+    """Return whether `err` means Google is unreachable or overloaded.
+
+    Only these errors are bridged with offline playback; authentication
+    failures and bugs have to surface as failed updates.
+    """
+    if isinstance(
+        err,
+        (GooglePhotosUnavailableError, aiohttp.ClientError, asyncio.TimeoutError),
+    ):
+        return True
+    if isinstance(err, GooglePhotosApiError):
+        return (
+            err.status >= HTTPStatus.INTERNAL_SERVER_ERROR
+            or err.status == HTTPStatus.TOO_MANY_REQUESTS
+        )
+    return False
@@ -0,0 +1,101 @@
+"""On-disk image cache for offline Google Photos playback."""
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import threading
+
+_LOGGER = logging.getLogger(__name__)
+
+# Ids of the cached items in slideshow order, written after each warm
+MANIFEST = "items.txt"
+
+
+def _file_name(item_id: str) -> str:
+    """Return the cache file name for a media item."""
+    return hashlib.sha1(item_id.encode()).hexdigest() + ".jpg"
+
+
+class ImageCache:
+    """Directory of downloaded slides, keyed by media item id.
+
+    All methods except `__contains__` and `__len__` block on disk I/O and
+    must be run in the executor.
+    """
+
+    def __init__(self, path: str) -> None:
+        """Initialize the cache."""
+        self._path = path
+        self._lock = threading.Lock()
+        self._names: set[str] = set()
+        self._item_ids: list[str] = []
+
+    def open(self) -> None:
+        """Create the cache directory and load the cached file names."""
+        os.makedirs(self._path, exist_ok=True)
+        try:
+            with open(os.path.join(self._path, MANIFEST), encoding="utf-8") as file:
+                item_ids = file.read().split()
+        except OSError:
+            item_ids = []
+        with self._lock:
+            self._names = {
+                name for name in os.listdir(self._path) if name.endswith(".jpg")
+            }
+            self._item_ids = item_ids
+
+    def item_ids(self) -> list[str]:
+        """Return the ids of the cached items in the order they were warmed."""
+        return [
+            item_id for item_id in self._item_ids if _file_name(item_id) in self._names
+        ]
+
+    def __contains__(self, item_id: str) -> bool:
+        """Return whether an item is cached."""
+        return _file_name(item_id) in self._names
+
+    def __len__(self) -> int:
+        """Return the number of cached items."""
+        return len(self._names)
+
+    def get(self, item_id: str) -> bytes | None:
+        """Return the cached image for an item, if any."""
+        name = _file_name(item_id)
+        if name not in self._names:
+            return None
+        try:
+            with open(os.path.join(self._path, name), "rb") as file:
+                return file.read()
+        except OSError as err:
+            _LOGGER.debug("Unable to read cached image %s: %s", item_id, err)
+            with self._lock:
+                self._names.discard(name)
+            return None
+
+    def put(self, item_id: str, data: bytes) -> None:
+        """Store the image for an item."""
+        name = _file_name(item_id)
+        path = os.path.join(self._path, name)
+        # Write to a temporary file first so readers never see partial images
+        with open(path + ".tmp", "wb") as file:
+            file.write(data)
+        os.replace(path + ".tmp", path)
+        with self._lock:
+            self._names.add(name)
+
+    def prune(self, keep: list[str]) -> int:
+        """Delete cached images for items not in `keep` and record its order."""
+        keep_names = {_file_name(item_id) for item_id in keep}
+        with open(os.path.join(self._path, MANIFEST), "w", encoding="utf-8") as file:
+            file.write("\n".join(keep))
+        with self._lock:
+            stale = self._names - keep_names
+            self._names &= keep_names
+            self._item_ids = list(keep)
+        for name in stale:
+            try:
+                os.remove(os.path.join(self._path, name))
+            except OSError as err:
+                _LOGGER.debug("Unable to remove cached image %s: %s", name, err)
+        return len(stale)
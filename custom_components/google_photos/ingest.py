@@ -0,0 +1,64 @@
+"""Staged ingest of picked Google Photos items into the media index."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+from typing import Any
+
+from .const import BATCH_GET_LIMIT, PICKER_INGEST_CONCURRENCY
+from .media_index import MediaIndex
+
+
+async def async_ingest_staged(
+    pages: AsyncIterator[list[dict[str, Any]]],
+    resolve: Callable[[list[str]], Awaitable[list[dict[str, Any]]]],
+    run: Callable[..., Awaitable[Any]],
+    index: MediaIndex,
+    staging: str,
+    scope: str,
+    sync_id: int,
+    concurrency: int = PICKER_INGEST_CONCURRENCY,
+) -> tuple[int, int]:
+    """Index picked items into `staging`, then swap them into `scope`.
+
+    Each page of picked items is split into batches that `resolve` turns
+    into media items, at most `concurrency` at a time, while the next page
+    is fetched. `run` executes blocking index calls, e.g. in the executor.
+    If any page or batch fails, the remaining batches are cancelled, the
+    staged items are dropped and `scope` is left as it was.
+
+    Returns the number of items indexed and the number picked.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _async_ingest_batch(batch: list[str]) -> int:
+        """Resolve and stage one batch of picked items."""
+        async with semaphore:
+            items = await resolve(batch)
+        await run(index.add_items, items, staging, sync_id)
+        return len(items)
+
+    tasks: list[asyncio.Task[int]] = []
+    picked = 0
+    try:
+        async for page in pages:
+            media_item_ids = [item["id"] for item in page if "id" in item]
+            picked += len(media_item_ids)
+            tasks.extend(
+                asyncio.create_task(
+                    _async_ingest_batch(
+                        media_item_ids[offset : offset + BATCH_GET_LIMIT]
+                    )
+                )
+                for offset in range(0, len(media_item_ids), BATCH_GET_LIMIT)
+            )
+        counts = await asyncio.gather(*tasks)
+    except BaseException:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await run(index.drop_scope, staging)
+        raise
+
+    await run(index.replace_scope, staging, scope)
+    return sum(counts), picked
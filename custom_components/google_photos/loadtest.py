@@ -0,0 +1,402 @@
+"""Offline load test for the Google Photos camera.
+
+Runs the coordinator and camera against a local stub of the Google Photos
+endpoints and simulates dashboard viewers polling the camera image and
+loading the card's photo URL on every slide change:
+
+    python -m custom_components.google_photos.loadtest --viewers 40
+
+Requires a Home Assistant installation. The stub runs in a separate
+process, so the event loop lag, CPU and memory in the report are those of
+the Home Assistant side only, alongside how many upstream image fetches
+each slide costs.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+from dataclasses import asdict, dataclass, field
+import json
+import multiprocessing
+from multiprocessing.connection import Connection
+import os
+import resource
+import statistics
+import tempfile
+import time
+from types import SimpleNamespace
+from typing import Any
+
+from aiohttp import web
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util import dt as dt_util
+
+from .api import GooglePhotosAPI
+from .camera import GooglePhotosCamera
+from .const import DEFAULT_SLIDESHOW_MODE
+from .coordinator import GooglePhotosCoordinator
+from .image_cache import ImageCache
+from .media_index import MediaIndex
+from .video_proxy import VideoProxy
+
+# How often the event loop lag sampler wakes up
+LAG_SAMPLE_INTERVAL = 0.1
+
+
+@dataclass
+class StubStats:
+    """Request counters for the stub Google endpoints."""
+
+    api_calls: dict[str, int] = field(default_factory=dict)
+    image_fetches: int = 0
+    image_bytes: int = 0
+
+
+class GooglePhotosStub:
+    """Local stand-in for the Google Photos API and image hosts."""
+
+    def __init__(
+        self, library_size: int, image_size: int, latency: float
+    ) -> None:
+        """Initialize the stub."""
+        self.library_size = library_size
+        self.image = os.urandom(image_size)
+        self.latency = latency
+        self.stats = StubStats()
+        self.base_url = ""
+        self._runner: web.AppRunner | None = None
+
+    def _item(self, index: int) -> dict[str, Any]:
+        """Return a fake media item."""
+        return {
+            "id": f"item{index}",
+            "baseUrl": f"{self.base_url}/img/item{index}",
+            "mimeType": "image/jpeg",
+            "mediaMetadata": {
+                "creationTime": f"2024-01-01T00:00:{index % 60:02d}Z",
+                "width": "1920",
+                "height": "1080",
+            },
+        }
+
+    def _count(self, name: str) -> None:
+        """Count a call to an API endpoint."""
+        self.stats.api_calls[name] = self.stats.api_calls.get(name, 0) + 1
+
+    async def _search(self, request: web.Request) -> web.Response:
+        """Handle mediaItems:search."""
+        self._count("search")
+        await asyncio.sleep(self.latency)
+        payload = await request.json()
+        start = int(payload.get("pageToken") or 0)
+        end = min(start + payload.get("pageSize", 50), self.library_size)
+        data: dict[str, Any] = {
+            "mediaItems": [self._item(index) for index in range(start, end)]
+        }
+        if end < self.library_size:
+            data["nextPageToken"] = str(end)
+        return web.json_response(data)
+
+    async def _batch_get(self, request: web.Request) -> web.Response:
+        """Handle mediaItems:batchGet."""
+        self._count("batch_get")
+        await asyncio.sleep(self.latency)
+        payload = await request.json()
+        return web.json_response(
+            {
+                "mediaItemResults": [
+                    {"mediaItem": self._item(int(item_id.removeprefix("item")))}
+                    for item_id in payload["mediaItemIds"]
+                ]
+            }
+        )
+
+    async def _album(self, request: web.Request) -> web.Response:
+        """Handle albums/{id}."""
+        self._count("album")
+        await asyncio.sleep(self.latency)
+        return web.json_response(
+            {"title": "Load test", "mediaItemsCount": str(self.library_size)}
+        )
+
+    async def _image(self, request: web.Request) -> web.Response:
+        """Serve a slide."""
+        self.stats.image_fetches += 1
+        self.stats.image_bytes += len(self.image)
+        await asyncio.sleep(self.latency)
+        return web.Response(body=self.image, content_type="image/jpeg")
+
+    async def async_start(self) -> None:
+        """Start the stub on a free local port."""
+        app = web.Application()
+        app.router.add_post("/v1/mediaItems:search", self._search)
+        app.router.add_post("/v1/mediaItems:batchGet", self._batch_get)
+        app.router.add_get("/v1/albums/{album_id}", self._album)
+        app.router.add_get("/img/{name}", self._image)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        port = self._runner.addresses[0][1]
+        self.base_url = f"http://127.0.0.1:{port}"
+
+    async def async_stop(self) -> None:
+        """Stop the stub."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+
+
+def _serve_stub(
+    conn: Connection, library_size: int, image_size: int, latency: float
+) -> None:
+    """Serve the stub, answering stats requests until told to stop."""
+
+    async def _async_serve() -> None:
+        stub = GooglePhotosStub(library_size, image_size, latency)
+        await stub.async_start()
+        conn.send(stub.base_url)
+        loop = asyncio.get_running_loop()
+        while await loop.run_in_executor(None, conn.recv) == "stats":
+            conn.send(asdict(stub.stats))
+        await stub.async_stop()
+
+    asyncio.run(_async_serve())
+
+
+class StubProcess:
+    """Run the stub in its own process and event loop."""
+
+    def __init__(self, args: argparse.Namespace) -> None:
+        """Initialize the process."""
+        context = multiprocessing.get_context("spawn")
+        self._conn, child_conn = context.Pipe()
+        self._process = context.Process(
+            target=_serve_stub,
+            args=(child_conn, args.library_size, args.image_size, args.latency),
+            daemon=True,
+        )
+        self.base_url = ""
+
+    def start(self) -> None:
+        """Start the stub and wait until it is listening."""
+        self._process.start()
+        self.base_url = self._conn.recv()
+
+    def stats(self) -> StubStats:
+        """Return the stub's request counters."""
+        self._conn.send("stats")
+        return StubStats(**self._conn.recv())
+
+    def stop(self) -> None:
+        """Stop the stub."""
+        self._conn.send("stop")
+        self._process.join(timeout=10)
+
+
+def _percentile(values: list[float], percent: float) -> float:
+    """Return a percentile of `values`, or 0 when empty."""
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100)[int(percent) - 1]
+
+
+async def _async_sample_lag(samples: list[float], stop: asyncio.Event) -> None:
+    """Measure how late the event loop wakes a sleeping task."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(LAG_SAMPLE_INTERVAL)
+        samples.append(time.perf_counter() - start - LAG_SAMPLE_INTERVAL)
+
+
+async def _async_viewer(
+    hass: HomeAssistant,
+    camera: GooglePhotosCamera,
+    coordinator: GooglePhotosCoordinator,
+    args: argparse.Namespace,
+    latencies: list[float],
+    stop: asyncio.Event,
+) -> int:
+    """Poll the camera image and load each new slide like the card does."""
+    session = async_get_clientsession(hass)
+    card_loads = 0
+    last_url: str | None = None
+    next_poll = time.monotonic()
+    while not stop.is_set():
+        if time.monotonic() >= next_poll:
+            start = time.perf_counter()
+            await camera.async_camera_image()
+            latencies.append(time.perf_counter() - start)
+            next_poll += args.poll_interval
+
+        photo_url = coordinator.data.get("photo_url")
+        if photo_url and photo_url != last_url:
+            last_url = photo_url
+            async with session.get(photo_url) as response:
+                await response.read()
+            card_loads += 1
+
+        await asyncio.sleep(min(0.25, args.poll_interval))
+    return card_loads
+
+
+async def _async_slideshow(
+    coordinator: GooglePhotosCoordinator,
+    interval: float,
+    stop: asyncio.Event,
+) -> int:
+    """Advance slides like the camera's slideshow loop and count them."""
+    slides = 1
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+        except asyncio.TimeoutError:
+            await coordinator.async_advance_slide()
+            slides += 1
+    return slides
+
+
+async def async_run(args: argparse.Namespace, stub: StubProcess) -> dict[str, Any]:
+    """Run one load test against a started stub and return the report."""
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        api = GooglePhotosAPI(
+            hass,
+            {"access_token": "loadtest", "expires_at": time.time() + 86400},
+            "loadtest",
+            "loadtest",
+            "loadtest",
+            api_base=f"{stub.base_url}/v1",
+        )
+        index = MediaIndex(
+            os.path.join(config_dir, "index.db"), dt_util.get_default_time_zone()
+        )
+        image_cache = ImageCache(os.path.join(config_dir, "images"))
+        await hass.async_add_executor_job(index.open)
+        await hass.async_add_executor_job(image_cache.open)
+        coordinator = GooglePhotosCoordinator(
+            hass,
+            api,
+            index,
+            image_cache,
+            None,
+            3600,
+            args.slideshow_interval,
+            DEFAULT_SLIDESHOW_MODE,
+            False,
+        )
+        await coordinator.async_refresh()
+        if args.warm_cache:
+            await coordinator.async_warm_cache()
+
+        camera = GooglePhotosCamera(
+            coordinator,
+            VideoProxy(hass, "loadtest"),
+            SimpleNamespace(entry_id="loadtest"),
+        )
+        camera.hass = hass
+
+        image_fetches_before = (await asyncio.to_thread(stub.stats)).image_fetches
+        warm_fetches_before = coordinator.cache_stats["warm_downloads"]
+        lag: list[float] = []
+        latencies: list[float] = []
+        stop = asyncio.Event()
+        cpu_start = time.process_time()
+        wall_start = time.monotonic()
+
+        sampler = asyncio.create_task(_async_sample_lag(lag, stop))
+        slideshow = asyncio.create_task(
+            _async_slideshow(coordinator, args.slideshow_interval, stop)
+        )
+        viewers = [
+            asyncio.create_task(
+                _async_viewer(hass, camera, coordinator, args, latencies, stop)
+            )
+            for _ in range(args.viewers)
+        ]
+
+        await asyncio.sleep(args.duration)
+        stop.set()
+        slides = await slideshow
+        await sampler
+        card_loads = sum(await asyncio.gather(*viewers))
+
+        wall = time.monotonic() - wall_start
+        cpu = time.process_time() - cpu_start
+        # Stop background re-warming so no download lands after the count
+        await coordinator.async_shutdown()
+        stub_stats = await asyncio.to_thread(stub.stats)
+        upstream = stub_stats.image_fetches - image_fetches_before
+        warm_fetches = coordinator.cache_stats["warm_downloads"] - warm_fetches_before
+
+        await hass.async_add_executor_job(index.close)
+        await hass.async_stop(force=True)
+
+    return {
+        "viewers": args.viewers,
+        "duration_s": round(wall, 1),
+        "slides": slides,
+        "camera_requests": len(latencies),
+        "upstream_image_fetches": upstream,
+        "upstream_fetches_per_slide": round(upstream / slides, 2),
+        "camera_upstream_fetches_per_slide": round(
+            (upstream - card_loads - warm_fetches) / slides, 2
+        ),
+        "card_image_loads": card_loads,
+        "warm_cache_fetches": warm_fetches,
+        "upstream_image_mib": round(upstream * args.image_size / 2**20, 1),
+        "api_calls": stub_stats.api_calls,
+        "camera_latency_ms": {
+            "p50": round(_percentile(latencies, 50) * 1000, 2),
+            "p99": round(_percentile(latencies, 99) * 1000, 2),
+        },
+        "loop_lag_ms": {
+            "p50": round(_percentile(lag, 50) * 1000, 2),
+            "p99": round(_percentile(lag, 99) * 1000, 2),
+            "max": round(max(lag, default=0.0) * 1000, 2),
+        },
+        "cpu_percent": round(cpu / wall * 100, 1),
+        # ru_maxrss is reported in KiB on Linux
+        "max_rss_mib": round(
+            resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1
+        ),
+    }
+
+
+def main() -> None:
+    """Parse arguments, run the load test and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--viewers", type=int, default=40)
+    parser.add_argument("--duration", type=float, default=60)
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=10,
+        help="seconds between camera image requests per viewer",
+    )
+    parser.add_argument("--slideshow-interval", type=float, default=10)
+    parser.add_argument("--library-size", type=int, default=500)
+    parser.add_argument("--image-size", type=int, default=300_000)
+    parser.add_argument(
+        "--latency", type=float, default=0.05, help="stub response delay (s)"
+    )
+    parser.add_argument(
+        "--warm-cache",
+        action="store_true",
+        help="warm the offline image cache before starting",
+    )
+    args = parser.parse_args()
+    stub = StubProcess(args)
+    stub.start()
+    try:
+        report = asyncio.run(async_run(args, stub))
+    finally:
+        stub.stop()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
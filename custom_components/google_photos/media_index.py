@@ -0,0 +1,436 @@
+"""SQLite-backed media index for Google Photos."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone, tzinfo
+import logging
+import re
+import sqlite3
+import threading
+from typing import Any
+
+from .const import (
+    LIBRARY_SCOPE,
+    PICKER_SCOPE,
+    SLIDESHOW_MODE_LANDSCAPE,
+    SLIDESHOW_MODE_LAST_30_DAYS,
+    SLIDESHOW_MODE_ON_THIS_DAY,
+    SLIDESHOW_MODE_PICKED,
+    SLIDESHOW_MODE_PORTRAIT,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Bump when the schema changes; the index is rebuilt by the next sync
+SCHEMA_VERSION = 3
+
+SCHEMA = """
+CREATE TABLE media (
+    id TEXT PRIMARY KEY,
+    base_url TEXT NOT NULL,
+    mime_type TEXT,
+    media_type TEXT NOT NULL,
+    creation_time INTEGER NOT NULL,
+    width INTEGER NOT NULL,
+    height INTEGER NOT NULL,
+    fetched_at INTEGER NOT NULL
+);
+CREATE TABLE album_items (
+    album_id TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    sync_id INTEGER NOT NULL,
+    creation_time INTEGER NOT NULL,
+    month_day TEXT NOT NULL,
+    orientation TEXT NOT NULL,
+    media_type TEXT NOT NULL,
+    PRIMARY KEY (album_id, item_id)
+) WITHOUT ROWID;
+CREATE INDEX album_items_time
+    ON album_items (album_id, creation_time, item_id, media_type);
+CREATE INDEX album_items_month_day
+    ON album_items (album_id, month_day, creation_time, item_id, media_type);
+CREATE INDEX album_items_orientation
+    ON album_items (album_id, orientation, creation_time, item_id, media_type);
+CREATE INDEX album_items_item ON album_items (item_id);
+CREATE TABLE sync_state (
+    album_id TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    synced_at INTEGER NOT NULL
+);
+"""
+
+UPSERT_MEDIA = """
+INSERT INTO media (
+    id, base_url, mime_type, media_type, creation_time, width, height, fetched_at
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    base_url = excluded.base_url,
+    mime_type = excluded.mime_type,
+    media_type = excluded.media_type,
+    creation_time = excluded.creation_time,
+    width = excluded.width,
+    height = excluded.height,
+    fetched_at = excluded.fetched_at
+"""
+
+UPSERT_MEMBERSHIP = """
+INSERT INTO album_items (
+    album_id, item_id, sync_id, creation_time, month_day, orientation, media_type
+) VALUES (?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (album_id, item_id) DO UPDATE SET
+    sync_id = excluded.sync_id,
+    creation_time = excluded.creation_time,
+    month_day = excluded.month_day,
+    orientation = excluded.orientation,
+    media_type = excluded.media_type
+"""
+
+SELECT_ITEMS = """
+SELECT a.item_id, a.creation_time, a.media_type, m.base_url, m.mime_type,
+    m.width, m.height, m.fetched_at
+FROM album_items a JOIN media m ON m.id = a.item_id
+"""
+
+DELETE_ORPHANS = (
+    "DELETE FROM media WHERE id NOT IN (SELECT item_id FROM album_items)"
+)
+
+# Google returns nanosecond precision, which datetime cannot parse
+_FRACTION = re.compile(r"\.(\d{6})\d*")
+
+# Slideshow position: items are ordered by creation time, then id
+SlideKey = tuple[int, str]
+
+
+def _parse_creation_time(value: str | None) -> datetime:
+    """Parse an RFC 3339 creationTime into an aware datetime."""
+    if not value:
+        return datetime.fromtimestamp(0, timezone.utc)
+    value = _FRACTION.sub(r".\1", value).replace("Z", "+00:00")
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        _LOGGER.debug("Unparseable creationTime: %s", value)
+        return datetime.fromtimestamp(0, timezone.utc)
+
+
+def _orientation(width: int, height: int) -> str:
+    """Return the orientation of an item from its dimensions."""
+    if width > height:
+        return SLIDESHOW_MODE_LANDSCAPE
+    if height > width:
+        return SLIDESHOW_MODE_PORTRAIT
+    return "square"
+
+
+def _row_to_item(row: sqlite3.Row) -> dict[str, Any]:
+    """Convert a selected row into a slideshow item."""
+    return {
+        "id": row["item_id"],
+        "baseUrl": row["base_url"],
+        "mimeType": row["mime_type"],
+        "mediaType": row["media_type"],
+        "creationTime": row["creation_time"],
+        "width": row["width"],
+        "height": row["height"],
+        "fetchedAt": row["fetched_at"],
+    }
+
+
+def slide_key(item: dict[str, Any]) -> SlideKey:
+    """Return the ordering key of a slideshow item."""
+    return (item["creationTime"], item["id"])
+
+
+class MediaIndex:
+    """Local index of media items with creation time, type and dimensions.
+
+    All methods block on disk I/O and must be run in the executor. The index
+    is rebuilt in batches during sync: each listing page is upserted with the
+    current sync id and memberships not seen by the end of the sync are
+    dropped.
+
+    Slideshow queries never materialize the whole result. Each scope's
+    membership rows carry the columns the modes filter and sort on, with a
+    composite index per mode, so counts and keyset-paged windows of slides
+    are answered from an index.
+    """
+
+    def __init__(self, path: str, time_zone: tzinfo) -> None:
+        """Initialize the index."""
+        self._path = path
+        self._time_zone = time_zone
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+
+    def open(self) -> None:
+        """Open the database and create the schema."""
+        with self._lock:
+            if self._conn is not None:
+                return
+            self._conn = sqlite3.connect(self._path, check_same_thread=False)
+            self._conn.row_factory = sqlite3.Row
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                with self._conn as conn:
+                    conn.execute("DROP TABLE IF EXISTS sync_state")
+                    conn.execute("DROP TABLE IF EXISTS album_items")
+                    conn.execute("DROP TABLE IF EXISTS media")
+                    conn.executescript(SCHEMA)
+                    conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def close(self) -> None:
+        """Close the database."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    @property
+    def _db(self) -> sqlite3.Connection:
+        """Return the open connection."""
+        if self._conn is None:
+            raise RuntimeError("Media index is not open")
+        return self._conn
+
+    def add_items(
+        self, items: list[dict[str, Any]], scope: str, sync_id: int
+    ) -> None:
+        """Upsert one batch of media items and their membership in `scope`.
+
+        The sync id is the sync start time in milliseconds and doubles as the
+        time the items' base URLs were fetched.
+        """
+        fetched_at = sync_id // 1000
+        media_rows = []
+        membership_rows = []
+        for item in items:
+            if not item.get("id"):
+                continue
+            metadata = item.get("mediaMetadata", {})
+            created = _parse_creation_time(metadata.get("creationTime"))
+            creation_time = int(created.timestamp())
+            width = int(metadata.get("width") or 0)
+            height = int(metadata.get("height") or 0)
+            media_type = "VIDEO" if "video" in metadata else "PHOTO"
+            media_rows.append(
+                (
+                    item["id"],
+                    item.get("baseUrl", ""),
+                    item.get("mimeType"),
+                    media_type,
+                    creation_time,
+                    width,
+                    height,
+                    fetched_at,
+                )
+            )
+            membership_rows.append(
+                (
+                    scope,
+                    item["id"],
+                    sync_id,
+                    creation_time,
+                    created.astimezone(self._time_zone).strftime("%m-%d"),
+                    _orientation(width, height),
+                    media_type,
+                )
+            )
+
+        with self._lock, self._db as conn:
+            conn.executemany(UPSERT_MEDIA, media_rows)
+            conn.executemany(UPSERT_MEMBERSHIP, membership_rows)
+
+    def finish_sync(self, scope: str, sync_id: int) -> int:
+        """Drop items in `scope` that were not seen by sync `sync_id`."""
+        with self._lock, self._db as conn:
+            removed = conn.execute(
+                "DELETE FROM album_items WHERE album_id = ? AND sync_id != ?",
+                (scope, sync_id),
+            ).rowcount
+            if removed:
+                conn.execute(DELETE_ORPHANS)
+        with self._lock:
+            # Keep planner statistics current as the index grows
+            self._db.execute("PRAGMA optimize")
+        return removed
+
+    def retain_scopes(self, scopes: set[str]) -> int:
+        """Drop every scope not in `scopes`, e.g. a previously used album."""
+        placeholders = ", ".join("?" * len(scopes))
+        with self._lock, self._db as conn:
+            removed = conn.execute(
+                f"DELETE FROM album_items WHERE album_id NOT IN ({placeholders})",
+                tuple(scopes),
+            ).rowcount
+            conn.execute(
+                f"DELETE FROM sync_state WHERE album_id NOT IN ({placeholders})",
+                tuple(scopes),
+            )
+            if removed:
+                conn.execute(DELETE_ORPHANS)
+        return removed
+
+    def sync_state(self, scope: str) -> tuple[str | None, int | None]:
+        """Return the fingerprint and time of the last full sync of `scope`."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT fingerprint, synced_at FROM sync_state WHERE album_id = ?",
+                (scope,),
+            ).fetchone()
+        if row is None:
+            return None, None
+        return row["fingerprint"], row["synced_at"]
+
+    def set_sync_state(self, scope: str, fingerprint: str, synced_at: int) -> None:
+        """Record a completed full sync of `scope`, surviving restarts."""
+        with self._lock, self._db as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO sync_state (album_id, fingerprint, synced_at)"
+                " VALUES (?, ?, ?)",
+                (scope, fingerprint, synced_at),
+            )
+
+    def replace_scope(self, source: str, target: str) -> int:
+        """Replace the items in `target` with those staged in `source`."""
+        with self._lock, self._db as conn:
+            conn.execute("DELETE FROM album_items WHERE album_id = ?", (target,))
+            moved = conn.execute(
+                "UPDATE album_items SET album_id = ? WHERE album_id = ?",
+                (target, source),
+            ).rowcount
+            conn.execute(DELETE_ORPHANS)
+        return moved
+
+    def drop_scope(self, scope: str) -> int:
+        """Drop every item in `scope`."""
+        with self._lock, self._db as conn:
+            removed = conn.execute(
+                "DELETE FROM album_items WHERE album_id = ?", (scope,)
+            ).rowcount
+            if removed:
+                conn.execute(DELETE_ORPHANS)
+        return removed
+
+    def update_base_urls(
+        self, items: list[dict[str, Any]], fetched_at: int
+    ) -> None:
+        """Store refreshed base URLs for already indexed items."""
+        with self._lock, self._db as conn:
+            conn.executemany(
+                "UPDATE media SET base_url = ?, fetched_at = ? WHERE id = ?",
+                [(item["baseUrl"], fetched_at, item["id"]) for item in items],
+            )
+
+    def _where(
+        self, scope: str, mode: str, include_videos: bool, now: datetime
+    ) -> tuple[str, list[Any]]:
+        """Return the WHERE clause selecting `mode` in `scope`."""
+        clauses = ["a.album_id = ?"]
+        params: list[Any] = [scope_for_mode(scope, mode)]
+
+        if not include_videos:
+            clauses.append("a.media_type = 'PHOTO'")
+
+        local_now = now.astimezone(self._time_zone)
+        if mode == SLIDESHOW_MODE_ON_THIS_DAY:
+            # Today's date in previous years only
+            start_of_year = local_now.replace(
+                month=1, day=1, hour=0, minute=0, second=0, microsecond=0
+            )
+            clauses.append("a.month_day = ? AND a.creation_time < ?")
+            params.extend(
+                (local_now.strftime("%m-%d"), int(start_of_year.timestamp()))
+            )
+        elif mode == SLIDESHOW_MODE_LAST_30_DAYS:
+            clauses.append("a.creation_time >= ?")
+            params.append(int((now - timedelta(days=30)).timestamp()))
+        elif mode in (SLIDESHOW_MODE_LANDSCAPE, SLIDESHOW_MODE_PORTRAIT):
+            clauses.append("a.orientation = ?")
+            params.append(mode)
+
+        return " WHERE " + " AND ".join(clauses), params
+
+    def count(
+        self, scope: str, mode: str, include_videos: bool, now: datetime
+    ) -> int:
+        """Return the number of items in `scope` matching slideshow `mode`."""
+        where, params = self._where(scope, mode, include_videos, now)
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM album_items a" + where, params
+            ).fetchone()[0]
+
+    def position(
+        self,
+        scope: str,
+        mode: str,
+        include_videos: bool,
+        now: datetime,
+        key: SlideKey,
+    ) -> int:
+        """Return how many matching items come before `key`."""
+        where, params = self._where(scope, mode, include_videos, now)
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM album_items a"
+                + where
+                + " AND (a.creation_time, a.item_id) < (?, ?)",
+                [*params, *key],
+            ).fetchone()[0]
+
+    def window(
+        self,
+        scope: str,
+        mode: str,
+        include_videos: bool,
+        now: datetime,
+        limit: int,
+        after: SlideKey | None = None,
+        inclusive: bool = False,
+    ) -> list[dict[str, Any]]:
+        """Return up to `limit` matching items in slideshow order.
+
+        Items start after `after` (or at it, when `inclusive`), or at the
+        beginning when `after` is None.
+        """
+        where, params = self._where(scope, mode, include_videos, now)
+        sql = SELECT_ITEMS + where
+        if after is not None:
+            operator = ">=" if inclusive else ">"
+            sql += f" AND (a.creation_time, a.item_id) {operator} (?, ?)"
+            params.extend(after)
+        sql += " ORDER BY a.creation_time, a.item_id LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [_row_to_item(row) for row in rows]
+
+    def items(
+        self, scope: str, item_ids: list[str], include_videos: bool
+    ) -> list[dict[str, Any]]:
+        """Return the given items from `scope` in slideshow order."""
+        if not item_ids:
+            return []
+        sql = SELECT_ITEMS + " WHERE a.album_id = ? AND a.item_id IN ({})".format(
+            ", ".join("?" * len(item_ids))
+        )
+        if not include_videos:
+            sql += " AND a.media_type = 'PHOTO'"
+        sql += " ORDER BY a.creation_time, a.item_id"
+
+        with self._lock:
+            rows = self._db.execute(sql, [scope, *item_ids]).fetchall()
+        return [_row_to_item(row) for row in rows]
+
+
+def scope_for_album(album_id: str | None) -> str:
+    """Return the index scope used for an album, or the whole library."""
+    return album_id or LIBRARY_SCOPE
+
+
+def scope_for_mode(scope: str, mode: str) -> str:
+    """Return the scope slideshow `mode` reads; picked items have their own."""
+    return PICKER_SCOPE if mode == SLIDESHOW_MODE_PICKED else scope
@@ -11,11 +11,16 @@ from homeassistant.core import callback
 
 from .const import (
     CONF_ALBUM_ID,
+    CONF_INCLUDE_VIDEOS,
     CONF_SLIDESHOW_INTERVAL,
+    CONF_SLIDESHOW_MODE,
     CONF_UPDATE_INTERVAL,
+    DEFAULT_INCLUDE_VIDEOS,
     DEFAULT_SLIDESHOW_INTERVAL,
+    DEFAULT_SLIDESHOW_MODE,
     DEFAULT_UPDATE_INTERVAL,
     DOMAIN,
+    SLIDESHOW_MODES,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -57,6 +62,18 @@ class GooglePhotosOptionsFlowHandler(OptionsFlow):
                             CONF_SLIDESHOW_INTERVAL, DEFAULT_SLIDESHOW_INTERVAL
                         ),
                     ): vol.All(vol.Coerce(int), vol.Range(min=1, max=300)),
+                    vol.Optional(
+                        CONF_SLIDESHOW_MODE,
+                        default=self.config_entry.options.get(
+                            CONF_SLIDESHOW_MODE, DEFAULT_SLIDESHOW_MODE
+                        ),
+                    ): vol.In(SLIDESHOW_MODES),
+                    vol.Optional(
+                        CONF_INCLUDE_VIDEOS,
+                        default=self.config_entry.options.get(
+                            CONF_INCLUDE_VIDEOS, DEFAULT_INCLUDE_VIDEOS
+                        ),
+                    ): bool,
                 }
             ),
         )
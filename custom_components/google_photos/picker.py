@@ -0,0 +1,147 @@
+"""Picker session management for Google Photos."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+from homeassistant.components import persistent_notification
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .api import GooglePhotosAPI
+from .const import DOMAIN, PICKER_SCOPE, SLIDESHOW_MODE_PICKED
+from .coordinator import GooglePhotosCoordinator
+from .ingest import async_ingest_staged
+from .scheduling import PollSchedule
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _notification_id(session_id: str) -> str:
+    """Return the id of the notification linking to a picker session."""
+    return f"{DOMAIN}_picker_{session_id}"
+
+
+class PickerSessionManager:
+    """Create picker sessions, poll them and ingest the picked items.
+
+    Polling follows the pollInterval and timeoutIn the server returns with
+    each session, backing off exponentially on errors. Once the user has
+    finished picking, the picked items are listed page by page and each page
+    is resolved in parallel batches while the next one is fetched. Items are
+    staged in their own index scope, which replaces the previous selection
+    only once every batch succeeded.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: GooglePhotosCoordinator
+    ) -> None:
+        """Initialize the manager."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self._tasks: dict[str, asyncio.Task] = {}
+
+    @property
+    def api(self) -> GooglePhotosAPI:
+        """Return the API client."""
+        return self.coordinator.api
+
+    async def async_start_session(
+        self, album_id: str | None = None
+    ) -> dict[str, Any]:
+        """Create a picker session, link to it and poll it in the background."""
+        session = await self.api.async_create_picker_session(album_id)
+        session_id = session["id"]
+        persistent_notification.async_create(
+            self.hass,
+            f"[Choose photos for the slideshow]({session['pickerUri']})",
+            title="Google Photos",
+            notification_id=_notification_id(session_id),
+        )
+        self._tasks[session_id] = self.hass.async_create_background_task(
+            self._async_poll(session), f"google_photos_picker_{session_id}"
+        )
+        self._tasks[session_id].add_done_callback(
+            lambda _: self._tasks.pop(session_id, None)
+        )
+        return session
+
+    async def async_shutdown(self) -> None:
+        """Cancel all sessions that are still being polled."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _async_poll(self, session: dict[str, Any]) -> None:
+        """Poll a session, then ingest the picked items and drop its link."""
+        try:
+            await self._async_poll_session(session)
+        finally:
+            persistent_notification.async_dismiss(
+                self.hass, _notification_id(session["id"])
+            )
+
+    async def _async_poll_session(self, session: dict[str, Any]) -> None:
+        """Poll a session until items are picked or it times out."""
+        session_id = session["id"]
+        schedule = PollSchedule(session.get("pollingConfig", {}))
+
+        while not session.get("mediaItemsSet"):
+            if schedule.expired():
+                _LOGGER.warning("Picker session %s timed out", session_id)
+                return
+            await asyncio.sleep(schedule.delay)
+
+            try:
+                session = await self.api.async_poll_picker_session(session_id)
+            except Exception as err:
+                schedule.failed()
+                _LOGGER.debug(
+                    "Polling picker session %s failed, retrying in %ss: %s",
+                    session_id,
+                    schedule.delay,
+                    err,
+                )
+                continue
+
+            # The server may adjust its recommendation as the session ages
+            schedule.update(session.get("pollingConfig", {}))
+
+        try:
+            await self._async_ingest(session_id)
+        except Exception as err:
+            _LOGGER.error("Failed to ingest picker session %s: %s", session_id, err)
+
+    async def _async_ingest(self, session_id: str) -> None:
+        """Resolve picked items in parallel batches and index them.
+
+        If any page or batch fails, the previous selection is left as it was.
+        """
+
+        async def _async_resolve(batch: list[str]) -> list[dict[str, Any]]:
+            """Resolve one batch of picked ids into media items."""
+            results = await self.api.async_get_media_items(batch)
+            return [
+                result["mediaItem"] for result in results if "mediaItem" in result
+            ]
+
+        indexed, picked = await async_ingest_staged(
+            self.api.async_iter_picked_media_item_pages(session_id),
+            _async_resolve,
+            self.hass.async_add_executor_job,
+            self.coordinator.index,
+            f"{PICKER_SCOPE}:{session_id}",
+            PICKER_SCOPE,
+            int(dt_util.utcnow().timestamp() * 1000),
+        )
+        _LOGGER.info(
+            "Indexed %s of %s items picked in session %s",
+            indexed,
+            picked,
+            session_id,
+        )
+
+        if self.coordinator.slideshow_mode == SLIDESHOW_MODE_PICKED:
+            await self.coordinator.async_set_slideshow_mode(SLIDESHOW_MODE_PICKED)
@@ -0,0 +1,94 @@
+"""Refresh and picker polling schedules for the Google Photos integration."""
+from __future__ import annotations
+
+from collections.abc import Callable
+from datetime import datetime, timedelta
+import re
+import time
+from typing import Any
+
+from .const import (
+    ADAPTIVE_MAX_INTERVAL,
+    ADAPTIVE_MIN_INTERVAL,
+    FULL_SYNC_MAX_AGE,
+    PICKER_DEFAULT_POLL_INTERVAL,
+    PICKER_DEFAULT_TIMEOUT,
+    PICKER_MAX_POLL_INTERVAL,
+)
+
+_DURATION = re.compile(r"^(\d+(?:\.\d+)?)s$")
+
+
+def adaptive_interval(changed: bool, current: float, base: float) -> float:
+    """Return the seconds until the next change check.
+
+    After a change the next check comes at a quarter of the configured
+    interval, but no sooner than ADAPTIVE_MIN_INTERVAL. While nothing
+    changes the interval doubles, up to ADAPTIVE_MAX_INTERVAL or the
+    configured interval if that is longer.
+    """
+    if changed:
+        return max(ADAPTIVE_MIN_INTERVAL, base / 4)
+    return min(current * 2, max(ADAPTIVE_MAX_INTERVAL, base))
+
+
+def needs_full_sync(
+    changed: bool, last_full_sync: datetime | None, now: datetime
+) -> bool:
+    """Return whether the whole library has to be listed again.
+
+    The fingerprint misses deletions outside the newest page, so a full sync
+    also runs once FULL_SYNC_MAX_AGE has passed since the last one.
+    """
+    return (
+        changed
+        or last_full_sync is None
+        or now - last_full_sync >= timedelta(seconds=FULL_SYNC_MAX_AGE)
+    )
+
+
+def parse_duration(value: str | None, default: float) -> float:
+    """Parse a protobuf duration string such as "5s" into seconds."""
+    if value and (match := _DURATION.match(value)):
+        return float(match.group(1))
+    return default
+
+
+class PollSchedule:
+    """When to poll a picker session, and when to give up on it.
+
+    Follows the pollInterval and timeoutIn the server returns with each
+    session, backing off exponentially while polls fail.
+    """
+
+    def __init__(
+        self,
+        polling: dict[str, Any],
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """Initialize the schedule from a session's pollingConfig."""
+        self._clock = clock
+        self.interval = parse_duration(
+            polling.get("pollInterval"), PICKER_DEFAULT_POLL_INTERVAL
+        )
+        self.deadline = clock() + parse_duration(
+            polling.get("timeoutIn"), PICKER_DEFAULT_TIMEOUT
+        )
+        self.delay = self.interval
+
+    def expired(self) -> bool:
+        """Return whether the session times out before the next poll."""
+        return self._clock() + self.delay > self.deadline
+
+    def failed(self) -> None:
+        """Back off after a failed poll."""
+        self.delay = min(self.delay * 2, PICKER_MAX_POLL_INTERVAL)
+
+    def update(self, polling: dict[str, Any]) -> None:
+        """Apply the server's latest recommendation after a successful poll."""
+        self.interval = parse_duration(polling.get("pollInterval"), self.interval)
+        if "timeoutIn" in polling:
+            self.deadline = self._clock() + parse_duration(
+                polling["timeoutIn"], PICKER_DEFAULT_TIMEOUT
+            )
+        self.delay = self.interval
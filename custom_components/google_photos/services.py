@@ -0,0 +1,112 @@
+"""Services for the Google Photos integration."""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_COUNT,
+    DOMAIN,
+    SERVICE_PICK_PHOTOS,
+    SERVICE_PROFILE_REFRESH,
+)
+from .coordinator import GooglePhotosCoordinator
+from .picker import PickerSessionManager
+from .tracing import PROFILE_HISTORY
+
+_LOGGER = logging.getLogger(__name__)
+
+PROFILE_REFRESH_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string,
+        vol.Optional(ATTR_COUNT, default=1): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=PROFILE_HISTORY)
+        ),
+    }
+)
+
+PICK_PHOTOS_SCHEMA = vol.Schema({vol.Optional(ATTR_CONFIG_ENTRY_ID): cv.string})
+
+
+def _get_entry_data(
+    hass: HomeAssistant, call: ServiceCall
+) -> list[dict[str, Any]]:
+    """Return the entry data targeted by a service call."""
+    entries = hass.data.get(DOMAIN, {})
+    entry_id = call.data.get(ATTR_CONFIG_ENTRY_ID)
+    if entry_id is None:
+        return list(entries.values())
+    if entry_id not in entries:
+        raise ServiceValidationError(f"Unknown Google Photos entry: {entry_id}")
+    return [entries[entry_id]]
+
+
+def _get_coordinators(
+    hass: HomeAssistant, call: ServiceCall
+) -> list[GooglePhotosCoordinator]:
+    """Return the coordinators targeted by a service call."""
+    return [data["coordinator"] for data in _get_entry_data(hass, call)]
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the Google Photos services."""
+    if hass.services.has_service(DOMAIN, SERVICE_PROFILE_REFRESH):
+        return
+
+    async def async_profile_refresh(call: ServiceCall) -> None:
+        """Profile the next refreshes and trigger the first one now."""
+        for coordinator in _get_coordinators(hass, call):
+            coordinator.profiler.arm(call.data[ATTR_COUNT])
+            _LOGGER.info(
+                "Profiling the next %s Google Photos refresh(es)",
+                call.data[ATTR_COUNT],
+            )
+            await coordinator.async_request_refresh()
+
+    async def async_pick_photos(call: ServiceCall) -> ServiceResponse:
+        """Start a picker session and ingest the selection when it is done."""
+        entries = _get_entry_data(hass, call)
+        if not entries:
+            raise ServiceValidationError("No Google Photos entries are set up")
+        if len(entries) > 1:
+            raise ServiceValidationError(
+                "Multiple Google Photos entries, please specify config_entry_id"
+            )
+        picker: PickerSessionManager = entries[0]["picker"]
+        session = await picker.async_start_session()
+        return {"session_id": session["id"], "picker_uri": session["pickerUri"]}
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PROFILE_REFRESH,
+        async_profile_refresh,
+        schema=PROFILE_REFRESH_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_PICK_PHOTOS,
+        async_pick_photos,
+        schema=PICK_PHOTOS_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+
+
+@callback
+def async_unload_services(hass: HomeAssistant) -> None:
+    """Remove the Google Photos services."""
+    hass.services.async_remove(DOMAIN, SERVICE_PROFILE_REFRESH)
+    hass.services.async_remove(DOMAIN, SERVICE_PICK_PHOTOS)
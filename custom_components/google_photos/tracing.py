@@ -0,0 +1,185 @@
+"""Refresh tracing and profiling for the Google Photos integration."""
+from __future__ import annotations
+
+import cProfile
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+import io
+import logging
+import pstats
+import time
+from typing import Any, ContextManager, Iterator
+
+_LOGGER = logging.getLogger(__name__)
+
+# Number of profile lines kept per captured refresh
+PROFILE_STATS_LIMIT = 60
+
+# Number of captured refresh profiles kept, and so the most one call can ask for
+PROFILE_HISTORY = 10
+
+# Spans of one name kept individually; later ones are folded into a summary
+SPAN_DETAIL_LIMIT = 20
+
+# Span attributes added up when spans are folded into a summary
+SUMMED_ATTRIBUTES = ("items", "bytes")
+
+
+@dataclass
+class TraceSpan:
+    """A single timed stage of a refresh."""
+
+    name: str
+    offset: float
+    duration: float = 0.0
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the span as a serializable dict."""
+        return {
+            "name": self.name,
+            "offset_ms": round(self.offset * 1000, 2),
+            "duration_ms": round(self.duration * 1000, 2),
+            **self.attributes,
+        }
+
+
+class RefreshTrace:
+    """Collection of timed spans for one coordinator refresh."""
+
+    def __init__(self) -> None:
+        """Initialize the trace."""
+        self.started = datetime.now(timezone.utc)
+        self._start = time.monotonic()
+        self.duration = 0.0
+        self.error: str | None = None
+        self.spans: list[TraceSpan] = []
+        self._counts: dict[str, int] = {}
+        self._summaries: dict[str, TraceSpan] = {}
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[TraceSpan]:
+        """Time the wrapped block as a span named `name`."""
+        begin = time.monotonic()
+        span = TraceSpan(name, begin - self._start, attributes=dict(attributes))
+        try:
+            yield span
+        finally:
+            span.duration = time.monotonic() - begin
+            self._add(span)
+
+    def _add(self, span: TraceSpan) -> None:
+        """Keep a span, folding it into a summary past SPAN_DETAIL_LIMIT.
+
+        A full sync of a large library lists thousands of pages; the summary
+        keeps their count, totals and slowest page instead.
+        """
+        count = self._counts.get(span.name, 0) + 1
+        self._counts[span.name] = count
+        if count <= SPAN_DETAIL_LIMIT:
+            self.spans.append(span)
+            return
+
+        if (summary := self._summaries.get(span.name)) is None:
+            summary = TraceSpan(
+                span.name,
+                span.offset,
+                attributes={"summarized": 0, "slowest_ms": 0.0},
+            )
+            self._summaries[span.name] = summary
+            self.spans.append(summary)
+        summary.duration += span.duration
+        summary.attributes["summarized"] += 1
+        for name in SUMMED_ATTRIBUTES:
+            if name in span.attributes:
+                summary.attributes[name] = (
+                    summary.attributes.get(name, 0) + span.attributes[name]
+                )
+        if span.duration * 1000 > summary.attributes["slowest_ms"]:
+            summary.attributes["slowest_ms"] = round(span.duration * 1000, 2)
+            summary.attributes["slowest"] = dict(span.attributes)
+
+    def finish(self, error: Exception | None = None) -> None:
+        """Mark the trace as complete."""
+        self.duration = time.monotonic() - self._start
+        if error is not None:
+            self.error = str(error)
+
+    def summary(self) -> str:
+        """Return a one-line summary for debug logging."""
+        totals: dict[str, float] = {}
+        for span in self.spans:
+            totals[span.name] = totals.get(span.name, 0.0) + span.duration
+        stages = ", ".join(
+            f"{name}={duration * 1000:.0f}ms" for name, duration in totals.items()
+        )
+        return f"{self.duration * 1000:.0f}ms total ({stages})"
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the trace as a serializable dict."""
+        return {
+            "started": self.started.isoformat(),
+            "duration_ms": round(self.duration * 1000, 2),
+            "error": self.error,
+            "spans": [
+                span.as_dict()
+                for span in sorted(self.spans, key=lambda span: span.offset)
+            ],
+        }
+
+
+def maybe_span(
+    trace: RefreshTrace | None, name: str, **attributes: Any
+) -> ContextManager[TraceSpan | None]:
+    """Return a span on `trace`, or a no-op context when not tracing."""
+    if trace is None:
+        return nullcontext()
+    return trace.span(name, **attributes)
+
+
+class RefreshProfiler:
+    """Opt-in cProfile capture of the next N coordinator refreshes.
+
+    The profiler runs on the event loop thread, so anything else scheduled on
+    the loop while a refresh is awaiting I/O shows up in the capture as well.
+    """
+
+    def __init__(self, keep: int = PROFILE_HISTORY) -> None:
+        """Initialize the profiler."""
+        self.remaining = 0
+        self._keep = keep
+        self.results: list[dict[str, Any]] = []
+
+    def arm(self, count: int) -> None:
+        """Capture a profile of the next `count` refreshes."""
+        self.remaining = count
+
+    def start(self) -> cProfile.Profile | None:
+        """Start profiling a refresh if a capture is pending."""
+        if self.remaining <= 0:
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as err:
+            # Another profiler is already active on this thread
+            _LOGGER.warning("Unable to start refresh profile: %s", err)
+            return None
+        self.remaining -= 1
+        return profile
+
+    def stop(self, profile: cProfile.Profile, trace: RefreshTrace) -> None:
+        """Stop profiling and store the formatted stats."""
+        profile.disable()
+        stream = io.StringIO()
+        stats = pstats.Stats(profile, stream=stream)
+        stats.sort_stats("cumulative").print_stats(PROFILE_STATS_LIMIT)
+        self.results.append(
+            {
+                "started": trace.started.isoformat(),
+                "duration_ms": round(trace.duration * 1000, 2),
+                "stats": stream.getvalue(),
+            }
+        )
+        del self.results[: -self._keep]
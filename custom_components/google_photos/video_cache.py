@@ -0,0 +1,151 @@
+"""Segment cache and byte-range helpers for the video proxy."""
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Mapping
+from http import HTTPStatus
+import re
+
+_RANGE = re.compile(r"^bytes=(\d*)-(\d*)$")
+_CONTENT_RANGE = re.compile(r"^bytes \d+-\d+/(\d+)$")
+
+
+class RangeNotSatisfiable(Exception):
+    """Raised when a Range header cannot be served."""
+
+
+class UpstreamError(Exception):
+    """Raised when Google answers a segment request with an error."""
+
+
+def parse_range(header: str | None, size: int) -> tuple[int, int] | None:
+    """Return the inclusive byte range a Range header asks for.
+
+    Returns None when the whole video is requested. Only a single range is
+    supported, as sent by ffmpeg and browsers.
+    """
+    if not header:
+        return None
+    match = _RANGE.match(header.strip())
+    if match is None or not any(match.groups()):
+        raise RangeNotSatisfiable(header)
+
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:
+        # Suffix range: the last N bytes
+        start = max(size - int(last), 0)
+        end = size - 1
+    if start > end:
+        raise RangeNotSatisfiable(header)
+    return start, end
+
+
+class SegmentCache:
+    """Videos registered with the proxy and their cached segments.
+
+    Segments are kept in an LRU bounded by `max_bytes`. Registered videos
+    are bounded by `max_sources`; evicting a video drops its upstream URL,
+    size, content type and segments together.
+    """
+
+    def __init__(self, segment_size: int, max_bytes: int, max_sources: int) -> None:
+        """Initialize the cache."""
+        self.segment_size = segment_size
+        self.max_bytes = max_bytes
+        self.max_sources = max_sources
+        self.cached_bytes = 0
+        self._sources: OrderedDict[str, str] = OrderedDict()
+        self._sizes: dict[str, int] = {}
+        self._content_types: dict[str, str] = {}
+        self._segments: OrderedDict[tuple[str, int], bytes] = OrderedDict()
+
+    def set_source(self, item_id: str, url: str) -> None:
+        """Register or refresh the upstream URL of a video."""
+        self._sources[item_id] = url
+        self._sources.move_to_end(item_id)
+        while len(self._sources) > self.max_sources:
+            evicted, _ = self._sources.popitem(last=False)
+            self._forget(evicted)
+
+    def source(self, item_id: str) -> str | None:
+        """Return the upstream URL of a registered video."""
+        return self._sources.get(item_id)
+
+    def size(self, item_id: str) -> int | None:
+        """Return the total size of a video, once known."""
+        return self._sizes.get(item_id)
+
+    def content_type(self, item_id: str) -> str:
+        """Return the content type reported upstream for a video."""
+        return self._content_types.get(item_id, "video/mp4")
+
+    def get(self, item_id: str, index: int) -> bytes | None:
+        """Return a cached segment and mark it as recently used."""
+        key = (item_id, index)
+        if (segment := self._segments.get(key)) is not None:
+            self._segments.move_to_end(key)
+        return segment
+
+    def store_response(
+        self,
+        item_id: str,
+        index: int,
+        status: int,
+        headers: Mapping[str, str],
+        body: bytes,
+    ) -> bytes:
+        """Cache the upstream response to a segment request and return it.
+
+        Google normally answers with 206. If it ignored the range and sent
+        the whole video, every segment in the body is cached.
+        """
+        start = index * self.segment_size
+        if status == HTTPStatus.PARTIAL_CONTENT:
+            size = None
+            if match := _CONTENT_RANGE.match(headers.get("Content-Range", "")):
+                size = int(match.group(1))
+            data = body
+        elif status == HTTPStatus.OK:
+            size = len(body)
+            data = body[start : start + self.segment_size]
+        else:
+            raise UpstreamError(f"Upstream returned {status} for video")
+
+        if item_id not in self._sources:
+            # Evicted while the segment was being fetched
+            return data
+
+        if size is not None:
+            self._sizes[item_id] = size
+        else:
+            self._sizes.setdefault(item_id, start + len(data))
+        self._content_types[item_id] = headers.get("Content-Type", "video/mp4")
+        if status == HTTPStatus.OK:
+            for offset in range(0, len(body), self.segment_size):
+                self._store(
+                    (item_id, offset // self.segment_size),
+                    body[offset : offset + self.segment_size],
+                )
+        else:
+            self._store((item_id, index), data)
+        return data
+
+    def _store(self, key: tuple[str, int], data: bytes) -> None:
+        """Add a segment, evicting the least recently used."""
+        if (previous := self._segments.pop(key, None)) is not None:
+            self.cached_bytes -= len(previous)
+        self._segments[key] = data
+        self.cached_bytes += len(data)
+        while self.cached_bytes > self.max_bytes and len(self._segments) > 1:
+            _, evicted = self._segments.popitem(last=False)
+            self.cached_bytes -= len(evicted)
+
+    def _forget(self, item_id: str) -> None:
+        """Drop everything cached for a video."""
+        self._sizes.pop(item_id, None)
+        self._content_types.pop(item_id, None)
+        for key in [key for key in self._segments if key[0] == item_id]:
+            self.cached_bytes -= len(self._segments.pop(key))
@@ -0,0 +1,170 @@
+"""Byte-range video proxy for Google Photos playback."""
+from __future__ import annotations
+
+import asyncio
+from http import HTTPStatus
+import logging
+import secrets
+from typing import Any
+
+import aiohttp
+from aiohttp import web
+
+from homeassistant.components.http import HomeAssistantView
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import (
+    DOMAIN,
+    VIDEO_CACHE_MAX_BYTES,
+    VIDEO_PROXY_MAX_SOURCES,
+    VIDEO_SEGMENT_SIZE,
+)
+from .video_cache import (
+    RangeNotSatisfiable,
+    SegmentCache,
+    UpstreamError,
+    parse_range,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class VideoProxy:
+    """Serve Google Photos videos locally with range support.
+
+    Videos are fetched from Google in fixed-size segments which are kept in
+    a bounded LRU cache, so seeking and looping a clip reuses what was
+    already downloaded. Concurrent requests for the same segment share one
+    upstream fetch.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the proxy."""
+        self.hass = hass
+        self.entry_id = entry_id
+        self.token = secrets.token_hex(16)
+        self.upstream_fetches = 0
+        self._cache = SegmentCache(
+            VIDEO_SEGMENT_SIZE, VIDEO_CACHE_MAX_BYTES, VIDEO_PROXY_MAX_SOURCES
+        )
+        self._inflight: dict[tuple[str, int], asyncio.Task[bytes]] = {}
+
+    def url_for(self, item: dict[str, Any]) -> str:
+        """Register an item, or refresh its URL, and return its proxy path."""
+        self._cache.set_source(item["id"], item["baseUrl"] + "=dv")
+        return (
+            f"{GooglePhotosVideoView.url_prefix}/{self.entry_id}/{item['id']}"
+            f"?token={self.token}"
+        )
+
+    def has_source(self, item_id: str) -> bool:
+        """Return whether an item has been registered with the proxy."""
+        return self._cache.source(item_id) is not None
+
+    async def async_get_segment(self, item_id: str, index: int) -> bytes:
+        """Return one segment of a video, fetching it at most once."""
+        if (segment := self._cache.get(item_id, index)) is not None:
+            return segment
+
+        key = (item_id, index)
+        if (task := self._inflight.get(key)) is None:
+            task = self.hass.async_create_task(self._async_fetch_segment(key))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def async_get_size(self, item_id: str) -> int:
+        """Return the total size of a video, fetching its first segment."""
+        if (size := self._cache.size(item_id)) is None:
+            await self.async_get_segment(item_id, 0)
+            size = self._cache.size(item_id)
+        if size is None:
+            raise web.HTTPNotFound
+        return size
+
+    def content_type(self, item_id: str) -> str:
+        """Return the content type reported upstream for a video."""
+        return self._cache.content_type(item_id)
+
+    async def _async_fetch_segment(self, key: tuple[str, int]) -> bytes:
+        """Fetch a segment from Google and store it in the cache."""
+        item_id, index = key
+        if (source := self._cache.source(item_id)) is None:
+            raise web.HTTPNotFound
+        start = index * VIDEO_SEGMENT_SIZE
+        end = start + VIDEO_SEGMENT_SIZE - 1
+        session = async_get_clientsession(self.hass)
+        self.upstream_fetches += 1
+
+        async with session.get(
+            source,
+            headers={"Range": f"bytes={start}-{end}"},
+            timeout=aiohttp.ClientTimeout(total=60),
+        ) as response:
+            body = await response.read()
+            try:
+                return self._cache.store_response(
+                    item_id, index, response.status, response.headers, body
+                )
+            except UpstreamError as err:
+                raise web.HTTPBadGateway(text=str(err)) from err
+
+
+class GooglePhotosVideoView(HomeAssistantView):
+    """View that streams proxied videos to the stream worker."""
+
+    url = "/api/google_photos/video/{entry_id}/{item_id}"
+    url_prefix = "/api/google_photos/video"
+    name = "api:google_photos:video"
+    # ffmpeg cannot authenticate; requests carry the proxy's token instead
+    requires_auth = False
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the view."""
+        self.hass = hass
+
+    async def get(
+        self, request: web.Request, entry_id: str, item_id: str
+    ) -> web.StreamResponse:
+        """Serve a video, honouring a single byte range."""
+        entry_data = self.hass.data.get(DOMAIN, {}).get(entry_id)
+        if entry_data is None:
+            raise web.HTTPNotFound
+        proxy: VideoProxy = entry_data["video_proxy"]
+        if not secrets.compare_digest(request.query.get("token", ""), proxy.token):
+            raise web.HTTPUnauthorized
+        if not proxy.has_source(item_id):
+            raise web.HTTPNotFound
+
+        size = await proxy.async_get_size(item_id)
+        try:
+            requested = parse_range(request.headers.get("Range"), size)
+        except RangeNotSatisfiable:
+            raise web.HTTPRequestRangeNotSatisfiable(
+                headers={"Content-Range": f"bytes */{size}"}
+            ) from None
+        if requested is None:
+            start, end = 0, size - 1
+            status = HTTPStatus.OK
+        else:
+            start, end = requested
+            status = HTTPStatus.PARTIAL_CONTENT
+
+        response = web.StreamResponse(status=status)
+        response.content_type = proxy.content_type(item_id)
+        response.content_length = end - start + 1
+        response.headers["Accept-Ranges"] = "bytes"
+        if status == HTTPStatus.PARTIAL_CONTENT:
+            response.headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        await response.prepare(request)
+
+        first_segment = start // VIDEO_SEGMENT_SIZE
+        last_segment = end // VIDEO_SEGMENT_SIZE
+        for index in range(first_segment, last_segment + 1):
+            segment = await proxy.async_get_segment(item_id, index)
+            offset = index * VIDEO_SEGMENT_SIZE
+            await response.write(segment[max(start - offset, 0) : end - offset + 1])
+
+        await response.write_eof()
+        return response
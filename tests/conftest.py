@@ -0,0 +1,23 @@
+"""Test configuration for the Google Photos integration.
+
+The media index, image cache and video range helpers do not depend on Home
+Assistant. The integration package is registered without running its
+`__init__`, so these modules can be tested without a Home Assistant install.
+"""
+from __future__ import annotations
+
+import os
+import sys
+import types
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = os.path.join(ROOT, "custom_components", "google_photos")
+
+for name, path in (
+    ("custom_components", os.path.dirname(PACKAGE)),
+    ("custom_components.google_photos", PACKAGE),
+):
+    if name not in sys.modules:
+        module = types.ModuleType(name)
+        module.__path__ = [path]
+        sys.modules[name] = module
@@ -0,0 +1,46 @@
+"""Tests for telling outages apart from other refresh failures."""
+from __future__ import annotations
+
+import asyncio
+
+import aiohttp
+import pytest
+
+from custom_components.google_photos.exceptions import (
+    GooglePhotosApiError,
+    GooglePhotosUnavailableError,
+    is_unavailable,
+)
+
+
+@pytest.mark.parametrize(
+    "err",
+    [
+        aiohttp.ClientConnectionError("connection refused"),
+        aiohttp.ServerDisconnectedError(),
+        asyncio.TimeoutError(),
+        GooglePhotosUnavailableError("token refresh failed"),
+        GooglePhotosApiError(500, "internal"),
+        GooglePhotosApiError(503, "unavailable"),
+        GooglePhotosApiError(429, "quota"),
+    ],
+)
+def test_unavailable(err: Exception) -> None:
+    """Test outages switch to offline playback."""
+    assert is_unavailable(err)
+
+
+@pytest.mark.parametrize(
+    "err",
+    [
+        GooglePhotosApiError(401, "unauthorized"),
+        GooglePhotosApiError(403, "forbidden"),
+        GooglePhotosApiError(404, "album not found"),
+        ValueError("No credentials available"),
+        RuntimeError("Media index is not open"),
+        KeyError("baseUrl"),
+    ],
+)
+def test_not_unavailable(err: Exception) -> None:
+    """Test auth failures and bugs surface as failed updates."""
+    assert not is_unavailable(err)
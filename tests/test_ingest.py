@@ -0,0 +1,115 @@
+"""Tests for staged ingest of picked items."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Any
+
+import pytest
+
+from custom_components.google_photos.const import (
+    BATCH_GET_LIMIT,
+    PICKER_SCOPE,
+    SLIDESHOW_MODE_ALL,
+    SLIDESHOW_MODE_PICKED,
+)
+from custom_components.google_photos.ingest import async_ingest_staged
+from custom_components.google_photos.media_index import MediaIndex
+
+NOW = datetime(2026, 10, 19, 12, tzinfo=timezone.utc)
+STAGING = f"{PICKER_SCOPE}:session"
+
+
+@pytest.fixture
+def index(tmp_path):
+    """Return an open media index."""
+    media_index = MediaIndex(str(tmp_path / "index.db"), timezone.utc)
+    media_index.open()
+    yield media_index
+    media_index.close()
+
+
+def _item(item_id: str) -> dict[str, Any]:
+    """Return a media item as resolved by the API."""
+    return {
+        "id": item_id,
+        "baseUrl": f"https://example.com/{item_id}",
+        "mimeType": "image/jpeg",
+        "mediaMetadata": {
+            "creationTime": "2026-01-01T00:00:00Z",
+            "width": "1920",
+            "height": "1080",
+        },
+    }
+
+
+async def _pages(*pages: list[str], fail: bool = False):
+    """Yield pages of picked items, then optionally fail the listing."""
+    for page in pages:
+        yield [{"id": item_id} for item_id in page]
+    if fail:
+        # Let the batches already started stage their items first
+        await asyncio.sleep(0)
+        raise RuntimeError("listing failed")
+
+
+async def _resolve(batch: list[str]) -> list[dict[str, Any]]:
+    """Resolve every picked id."""
+    return [_item(item_id) for item_id in batch]
+
+
+async def _run(func, *args):
+    """Run an index call inline, as the executor would."""
+    return func(*args)
+
+
+def _picked(index: MediaIndex) -> int:
+    """Return the number of items in the current selection."""
+    return index.count(PICKER_SCOPE, SLIDESHOW_MODE_PICKED, True, NOW)
+
+
+def _ingest(index: MediaIndex, pages, resolve=_resolve) -> tuple[int, int]:
+    """Ingest pages into the picker scope."""
+    return asyncio.run(
+        async_ingest_staged(pages, resolve, _run, index, STAGING, PICKER_SCOPE, 1000)
+    )
+
+
+def test_ingest_replaces_selection(index: MediaIndex) -> None:
+    """Test a successful ingest replaces the previous selection."""
+    index.add_items([_item("old")], PICKER_SCOPE, 1000)
+
+    ids = [f"item{number}" for number in range(BATCH_GET_LIMIT + 10)]
+    assert _ingest(index, _pages(ids[:30], ids[30:])) == (len(ids), len(ids))
+
+    assert _picked(index) == len(ids)
+    assert index.items(PICKER_SCOPE, ["old"], True) == []
+    assert index.count(STAGING, SLIDESHOW_MODE_ALL, True, NOW) == 0
+
+
+def test_failed_batch_keeps_selection(index: MediaIndex) -> None:
+    """Test a failed batch drops the staged items and keeps the selection."""
+    index.add_items([_item("old")], PICKER_SCOPE, 1000)
+
+    async def _resolve_failing(batch: list[str]) -> list[dict[str, Any]]:
+        if "item60" in batch:
+            raise RuntimeError("batch failed")
+        return await _resolve(batch)
+
+    ids = [f"item{number}" for number in range(BATCH_GET_LIMIT * 2)]
+    with pytest.raises(RuntimeError, match="batch failed"):
+        _ingest(index, _pages(ids), _resolve_failing)
+
+    assert _picked(index) == 1
+    assert index.count(STAGING, SLIDESHOW_MODE_ALL, True, NOW) == 0
+
+
+def test_failed_listing_keeps_selection(index: MediaIndex) -> None:
+    """Test a listing that fails part way keeps the previous selection."""
+    index.add_items([_item("old")], PICKER_SCOPE, 1000)
+
+    with pytest.raises(RuntimeError, match="listing failed"):
+        _ingest(index, _pages(["item1", "item2"], fail=True))
+
+    assert _picked(index) == 1
+    assert index.count(STAGING, SLIDESHOW_MODE_ALL, True, NOW) == 0
@@ -0,0 +1,282 @@
+"""Tests for the Google Photos media index."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from custom_components.google_photos.const import (
+    LIBRARY_SCOPE,
+    PICKER_SCOPE,
+    SLIDESHOW_MODE_ALL,
+    SLIDESHOW_MODE_LANDSCAPE,
+    SLIDESHOW_MODE_LAST_30_DAYS,
+    SLIDESHOW_MODE_ON_THIS_DAY,
+    SLIDESHOW_MODE_PICKED,
+    SLIDESHOW_MODE_PORTRAIT,
+)
+from custom_components.google_photos.media_index import (
+    SCHEMA_VERSION,
+    MediaIndex,
+    _parse_creation_time,
+    scope_for_album,
+    scope_for_mode,
+    slide_key,
+)
+
+NOW = datetime(2026, 10, 19, 12, tzinfo=timezone.utc)
+
+
+def _item(
+    item_id: str,
+    created: str,
+    width: int = 1920,
+    height: int = 1080,
+    video: bool = False,
+) -> dict:
+    """Return a media item as listed by the API."""
+    metadata = {"creationTime": created, "width": str(width), "height": str(height)}
+    if video:
+        metadata["video"] = {}
+    return {
+        "id": item_id,
+        "baseUrl": f"https://example.com/{item_id}",
+        "mimeType": "video/mp4" if video else "image/jpeg",
+        "mediaMetadata": metadata,
+    }
+
+
+@pytest.fixture
+def index(tmp_path):
+    """Return an open media index."""
+    media_index = MediaIndex(str(tmp_path / "index.db"), timezone.utc)
+    media_index.open()
+    yield media_index
+    media_index.close()
+
+
+def _ids(items: list[dict]) -> list[str]:
+    """Return the ids of `items`."""
+    return [item["id"] for item in items]
+
+
+def _window(index: MediaIndex, mode: str, **kwargs) -> list[str]:
+    """Return the ids of the whole slideshow for `mode`."""
+    include_videos = kwargs.pop("include_videos", False)
+    return _ids(
+        index.window(LIBRARY_SCOPE, mode, include_videos, NOW, 100, **kwargs)
+    )
+
+
+def test_parse_creation_time() -> None:
+    """Test nanosecond precision and missing values are handled."""
+    assert _parse_creation_time("2024-03-01T10:20:30.123456789Z") == datetime(
+        2024, 3, 1, 10, 20, 30, 123456, tzinfo=timezone.utc
+    )
+    assert _parse_creation_time("2024-03-01T10:20:30+02:00").utcoffset()
+    assert _parse_creation_time(None).timestamp() == 0
+    assert _parse_creation_time("yesterday").timestamp() == 0
+
+
+def test_modes(index: MediaIndex) -> None:
+    """Test each slideshow mode selects and orders the right items."""
+    index.add_items(
+        [
+            _item("recent", "2026-10-10T00:00:00Z"),
+            _item("this_year", "2026-10-19T08:00:00Z", 1080, 1920),
+            _item("last_year", "2025-10-19T08:00:00Z"),
+            _item("old", "2019-10-19T23:00:00Z", 1000, 1000),
+            _item("other_day", "2019-05-01T00:00:00Z", 1080, 1920),
+            _item("clip", "2026-10-18T00:00:00Z", video=True),
+        ],
+        LIBRARY_SCOPE,
+        1000,
+    )
+
+    assert _window(index, SLIDESHOW_MODE_ALL) == [
+        "other_day",
+        "old",
+        "last_year",
+        "recent",
+        "this_year",
+    ]
+    assert "clip" in _window(index, SLIDESHOW_MODE_ALL, include_videos=True)
+    # Previous years only
+    assert _window(index, SLIDESHOW_MODE_ON_THIS_DAY) == ["old", "last_year"]
+    assert _window(index, SLIDESHOW_MODE_LAST_30_DAYS) == ["recent", "this_year"]
+    assert _window(index, SLIDESHOW_MODE_LANDSCAPE) == ["last_year", "recent"]
+    assert _window(index, SLIDESHOW_MODE_PORTRAIT) == ["other_day", "this_year"]
+    assert index.count(LIBRARY_SCOPE, SLIDESHOW_MODE_ALL, False, NOW) == 5
+    assert index.count(LIBRARY_SCOPE, SLIDESHOW_MODE_ALL, True, NOW) == 6
+
+
+def test_on_this_day_uses_local_date(tmp_path) -> None:
+    """Test on this day compares dates in the configured time zone."""
+    media_index = MediaIndex(
+        str(tmp_path / "index.db"), timezone(timedelta(hours=-10))
+    )
+    media_index.open()
+    try:
+        # October 19th locally, but already October 20th in UTC
+        media_index.add_items(
+            [_item("local", "2020-10-20T06:00:00Z")], LIBRARY_SCOPE, 1000
+        )
+        assert _ids(
+            media_index.window(
+                LIBRARY_SCOPE, SLIDESHOW_MODE_ON_THIS_DAY, False, NOW, 10
+            )
+        ) == ["local"]
+    finally:
+        media_index.close()
+
+
+def test_window_paging(index: MediaIndex) -> None:
+    """Test keyset paging, positions and lookups by id."""
+    index.add_items(
+        [_item(f"item{i:02d}", f"2024-01-01T00:00:{i:02d}Z") for i in range(30)],
+        LIBRARY_SCOPE,
+        1000,
+    )
+
+    first = index.window(LIBRARY_SCOPE, SLIDESHOW_MODE_ALL, False, NOW, 10)
+    assert _ids(first) == [f"item{i:02d}" for i in range(10)]
+    second = index.window(
+        LIBRARY_SCOPE,
+        SLIDESHOW_MODE_ALL,
+        False,
+        NOW,
+        10,
+        after=slide_key(first[-1]),
+    )
+    assert _ids(second) == [f"item{i:02d}" for i in range(10, 20)]
+    inclusive = index.window(
+        LIBRARY_SCOPE,
+        SLIDESHOW_MODE_ALL,
+        False,
+        NOW,
+        2,
+        after=slide_key(second[0]),
+        inclusive=True,
+    )
+    assert _ids(inclusive) == ["item10", "item11"]
+    assert (
+        index.position(
+            LIBRARY_SCOPE, SLIDESHOW_MODE_ALL, False, NOW, slide_key(second[0])
+        )
+        == 10
+    )
+    assert _ids(index.items(LIBRARY_SCOPE, ["item29", "item03", "gone"], False)) == [
+        "item03",
+        "item29",
+    ]
+
+
+def test_finish_sync_removes_unseen(index: MediaIndex) -> None:
+    """Test items not seen by a sync are dropped and updates are applied."""
+    index.add_items(
+        [_item("keep", "2024-01-01T00:00:00Z"), _item("gone", "2024-01-02T00:00:00Z")],
+        LIBRARY_SCOPE,
+        1000,
+    )
+    index.add_items([_item("keep", "2024-01-03T00:00:00Z")], LIBRARY_SCOPE, 2000)
+
+    assert index.finish_sync(LIBRARY_SCOPE, 2000) == 1
+    items = index.window(LIBRARY_SCOPE, SLIDESHOW_MODE_ALL, False, NOW, 10)
+    assert _ids(items) == ["keep"]
+    assert items[0]["fetchedAt"] == 2
+    assert index._db.execute("SELECT COUNT(*) FROM media").fetchone()[0] == 1
+
+
+def test_scopes(index: MediaIndex) -> None:
+    """Test picked items and albums are kept apart and stale scopes dropped."""
+    index.add_items([_item("a", "2024-01-01T00:00:00Z")], "album1", 1000)
+    index.add_items([_item("b", "2024-01-01T00:00:00Z")], "album2", 1000)
+    index.add_items([_item("c", "2024-01-01T00:00:00Z")], PICKER_SCOPE, 1000)
+
+    assert _ids(
+        index.window("album2", SLIDESHOW_MODE_PICKED, False, NOW, 10)
+    ) == ["c"]
+    assert index.retain_scopes({"album2", PICKER_SCOPE}) == 1
+    assert index.count("album1", SLIDESHOW_MODE_ALL, False, NOW) == 0
+    assert index._db.execute("SELECT COUNT(*) FROM media").fetchone()[0] == 2
+
+
+def test_update_base_urls(index: MediaIndex) -> None:
+    """Test refreshed base URLs are stored."""
+    index.add_items([_item("a", "2024-01-01T00:00:00Z")], LIBRARY_SCOPE, 1000)
+    index.update_base_urls([{"id": "a", "baseUrl": "https://new"}], 50)
+
+    (item,) = index.window(LIBRARY_SCOPE, SLIDESHOW_MODE_ALL, False, NOW, 10)
+    assert item["baseUrl"] == "https://new"
+    assert item["fetchedAt"] == 50
+
+
+def test_schema_upgrade(tmp_path) -> None:
+    """Test an index with an older schema is rebuilt."""
+    path = str(tmp_path / "index.db")
+    media_index = MediaIndex(path, timezone.utc)
+    media_index.open()
+    media_index._db.execute("PRAGMA user_version=1")
+    media_index.close()
+
+    media_index.open()
+    try:
+        version = media_index._db.execute("PRAGMA user_version").fetchone()[0]
+        assert version == SCHEMA_VERSION
+    finally:
+        media_index.close()
+
+
+def test_replace_scope(index: MediaIndex) -> None:
+    """Test a staged selection replaces the previous one in one step."""
+    index.add_items([_item("old", "2024-01-01T00:00:00Z")], PICKER_SCOPE, 1000)
+    index.add_items(
+        [_item("new", "2024-01-02T00:00:00Z")], f"{PICKER_SCOPE}:session", 2000
+    )
+
+    assert index.replace_scope(f"{PICKER_SCOPE}:session", PICKER_SCOPE) == 1
+    assert _ids(index.window("", SLIDESHOW_MODE_PICKED, False, NOW, 10)) == ["new"]
+    assert index.count(f"{PICKER_SCOPE}:session", SLIDESHOW_MODE_ALL, False, NOW) == 0
+
+
+def test_drop_scope(index: MediaIndex) -> None:
+    """Test a failed staging scope is dropped without touching the selection."""
+    index.add_items([_item("kept", "2024-01-01T00:00:00Z")], PICKER_SCOPE, 1000)
+    index.add_items(
+        [
+            _item("kept", "2024-01-01T00:00:00Z"),
+            _item("partial", "2024-01-02T00:00:00Z"),
+        ],
+        f"{PICKER_SCOPE}:session",
+        2000,
+    )
+
+    assert index.drop_scope(f"{PICKER_SCOPE}:session") == 2
+    assert _ids(index.window("", SLIDESHOW_MODE_PICKED, False, NOW, 10)) == ["kept"]
+    assert index._db.execute("SELECT COUNT(*) FROM media").fetchone()[0] == 1
+
+
+def test_sync_state_survives_reopen(tmp_path) -> None:
+    """Test the last full sync is remembered across restarts."""
+    path = str(tmp_path / "index.db")
+    media_index = MediaIndex(path, timezone.utc)
+    media_index.open()
+    assert media_index.sync_state("album") == (None, None)
+    media_index.set_sync_state("album", "abc", 1000)
+    media_index.set_sync_state("album", "def", 2000)
+    media_index.close()
+
+    media_index.open()
+    try:
+        assert media_index.sync_state("album") == ("def", 2000)
+        media_index.retain_scopes({"other"})
+        assert media_index.sync_state("album") == (None, None)
+    finally:
+        media_index.close()
+
+
+def test_scope_for_mode() -> None:
+    """Test picked mode reads the picker scope whatever album is configured."""
+    assert scope_for_mode(scope_for_album("album1"), SLIDESHOW_MODE_ALL) == "album1"
+    assert scope_for_mode(scope_for_album(None), SLIDESHOW_MODE_ALL) == LIBRARY_SCOPE
+    assert scope_for_mode("album1", SLIDESHOW_MODE_PICKED) == PICKER_SCOPE
@@ -0,0 +1,126 @@
+"""Tests for refresh and picker polling schedules."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+from custom_components.google_photos.const import (
+    ADAPTIVE_MAX_INTERVAL,
+    ADAPTIVE_MIN_INTERVAL,
+    FULL_SYNC_MAX_AGE,
+    PICKER_DEFAULT_POLL_INTERVAL,
+    PICKER_DEFAULT_TIMEOUT,
+    PICKER_MAX_POLL_INTERVAL,
+)
+from custom_components.google_photos.scheduling import (
+    PollSchedule,
+    adaptive_interval,
+    needs_full_sync,
+    parse_duration,
+)
+
+NOW = datetime(2026, 10, 19, 12, tzinfo=timezone.utc)
+
+
+def test_interval_tightens_after_change() -> None:
+    """Test a change brings the next check forward, but not below the floor."""
+    assert adaptive_interval(True, 21600, 3600) == 900
+    assert adaptive_interval(True, 21600, 600) == ADAPTIVE_MIN_INTERVAL
+
+
+def test_interval_backs_off_while_idle() -> None:
+    """Test the interval doubles up to the ceiling while nothing changes."""
+    interval = adaptive_interval(True, 3600, 3600)
+    seen = []
+    for _ in range(10):
+        interval = adaptive_interval(False, interval, 3600)
+        seen.append(interval)
+
+    assert seen[:4] == [1800, 3600, 7200, 14400]
+    assert seen[-1] == ADAPTIVE_MAX_INTERVAL
+
+
+def test_interval_ceiling_follows_long_update_interval() -> None:
+    """Test a configured interval above the ceiling is still honoured."""
+    assert adaptive_interval(False, 86400, 86400) == 86400
+
+
+def test_full_sync_decision() -> None:
+    """Test when the whole library is listed again."""
+    recent = NOW - timedelta(hours=1)
+    stale = NOW - timedelta(seconds=FULL_SYNC_MAX_AGE)
+
+    assert needs_full_sync(False, None, NOW)
+    assert needs_full_sync(True, recent, NOW)
+    assert not needs_full_sync(False, recent, NOW)
+    assert needs_full_sync(False, stale, NOW)
+
+
+class FakeClock:
+    """A monotonic clock that only moves when told to."""
+
+    def __init__(self) -> None:
+        """Start the clock at zero."""
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        """Return the current time."""
+        return self.now
+
+
+def test_parse_duration() -> None:
+    """Test protobuf durations are parsed and anything else falls back."""
+    assert parse_duration("5s", 1) == 5
+    assert parse_duration("2.5s", 1) == 2.5
+    assert parse_duration("5m", 1) == 1
+    assert parse_duration(None, 3) == 3
+    assert parse_duration("", 3) == 3
+
+
+def test_poll_schedule_follows_server() -> None:
+    """Test the schedule uses the server's interval and timeout."""
+    clock = FakeClock()
+    schedule = PollSchedule({"pollInterval": "3s", "timeoutIn": "10s"}, clock)
+    assert schedule.delay == 3
+    assert not schedule.expired()
+
+    clock.now = 7
+    assert not schedule.expired()
+    clock.now = 7.5
+    assert schedule.expired()
+
+    # A later poll may extend the session and change the interval
+    schedule.update({"pollInterval": "1s", "timeoutIn": "60s"})
+    assert schedule.delay == 1
+    assert schedule.deadline == 67.5
+    assert not schedule.expired()
+
+
+def test_poll_schedule_defaults() -> None:
+    """Test a session without pollingConfig uses the defaults."""
+    clock = FakeClock()
+    schedule = PollSchedule({}, clock)
+    assert schedule.interval == PICKER_DEFAULT_POLL_INTERVAL
+    assert schedule.deadline == PICKER_DEFAULT_TIMEOUT
+
+    # An update without a timeout keeps the deadline and interval
+    clock.now = 10
+    schedule.update({})
+    assert schedule.deadline == PICKER_DEFAULT_TIMEOUT
+    assert schedule.delay == PICKER_DEFAULT_POLL_INTERVAL
+
+
+def test_poll_schedule_backs_off() -> None:
+    """Test failed polls back off up to the cap and success resets."""
+    schedule = PollSchedule(
+        {"pollInterval": "5s", "timeoutIn": "3600s"}, FakeClock()
+    )
+    delays = []
+    for _ in range(10):
+        schedule.failed()
+        delays.append(schedule.delay)
+    assert delays[:3] == [10, 20, 40]
+    assert max(delays) == PICKER_MAX_POLL_INTERVAL
+    assert delays == sorted(delays)
+
+    schedule.update({})
+    assert schedule.delay == 5
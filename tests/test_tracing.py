@@ -0,0 +1,87 @@
+"""Tests for refresh tracing and profiling."""
+from __future__ import annotations
+
+from custom_components.google_photos.tracing import (
+    PROFILE_HISTORY,
+    SPAN_DETAIL_LIMIT,
+    RefreshProfiler,
+    RefreshTrace,
+    maybe_span,
+)
+
+
+def test_spans() -> None:
+    """Test spans are timed, ordered and summarized."""
+    trace = RefreshTrace()
+    with trace.span("change_check", changed=True) as span:
+        span.attributes["items"] = 3
+    with maybe_span(trace, "batch_get", items=2):
+        pass
+    with maybe_span(trace, "batch_get", items=5):
+        pass
+    trace.finish()
+
+    data = trace.as_dict()
+    assert [span["name"] for span in data["spans"]] == [
+        "change_check",
+        "batch_get",
+        "batch_get",
+    ]
+    assert data["spans"][0]["changed"] is True
+    assert data["spans"][0]["items"] == 3
+    assert data["error"] is None
+    summary = trace.summary()
+    assert summary.endswith("(change_check=0ms, batch_get=0ms)")
+
+
+def test_maybe_span_without_trace() -> None:
+    """Test spans are skipped when not tracing."""
+    with maybe_span(None, "batch_get") as span:
+        assert span is None
+
+
+def test_error() -> None:
+    """Test a failed refresh records its error."""
+    trace = RefreshTrace()
+    trace.finish(ValueError("boom"))
+    assert trace.as_dict()["error"] == "boom"
+
+
+def test_pages_past_limit_are_summarized() -> None:
+    """Test a long listing keeps a bounded number of spans."""
+    trace = RefreshTrace()
+    pages = SPAN_DETAIL_LIMIT + 500
+    for page in range(pages):
+        with trace.span("media_page", page=page) as span:
+            span.attributes.update(items=50, bytes=1000)
+    trace.finish()
+
+    spans = trace.as_dict()["spans"]
+    assert len(spans) == SPAN_DETAIL_LIMIT + 1
+    summary = spans[-1]
+    assert summary["name"] == "media_page"
+    assert summary["summarized"] == 500
+    assert summary["items"] == 500 * 50
+    assert summary["bytes"] == 500 * 1000
+    assert summary["slowest"]["page"] >= SPAN_DETAIL_LIMIT
+    assert "media_page=" in trace.summary()
+
+
+def test_profiler() -> None:
+    """Test the profiler captures only armed refreshes and keeps the newest."""
+    profiler = RefreshProfiler()
+    assert profiler.start() is None
+
+    profiler.arm(PROFILE_HISTORY + 2)
+    for _ in range(PROFILE_HISTORY + 2):
+        trace = RefreshTrace()
+        profile = profiler.start()
+        assert profile is not None
+        sum(range(1000))
+        trace.finish()
+        profiler.stop(profile, trace)
+
+    assert profiler.remaining == 0
+    assert profiler.start() is None
+    assert len(profiler.results) == PROFILE_HISTORY
+    assert "function calls" in profiler.results[-1]["stats"]
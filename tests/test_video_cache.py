@@ -0,0 +1,130 @@
+"""Tests for the video proxy's segment cache and range parsing."""
+from __future__ import annotations
+
+import pytest
+
+from custom_components.google_photos.video_cache import (
+    RangeNotSatisfiable,
+    SegmentCache,
+    UpstreamError,
+    parse_range,
+)
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (None, None),
+        ("bytes=0-", (0, 999)),
+        ("bytes=100-199", (100, 199)),
+        ("bytes=900-5000", (900, 999)),
+        ("bytes=-100", (900, 999)),
+        ("bytes=-5000", (0, 999)),
+        (" bytes=0-0 ", (0, 0)),
+    ],
+)
+def test_parse_range(header: str | None, expected: tuple[int, int] | None) -> None:
+    """Test satisfiable ranges, including suffix ranges."""
+    assert parse_range(header, 1000) == expected
+
+
+@pytest.mark.parametrize(
+    "header",
+    [
+        "bytes=1000-",
+        "bytes=500-100",
+        "bytes=-0",
+        "bytes=-",
+        "bytes=0-1,5-6",
+        "items=0-1",
+    ],
+)
+def test_parse_range_not_satisfiable(header: str) -> None:
+    """Test out of range and malformed ranges are rejected."""
+    with pytest.raises(RangeNotSatisfiable):
+        parse_range(header, 1000)
+
+
+def _cache(max_bytes: int = 100, max_sources: int = 4) -> SegmentCache:
+    """Return a cache with 10 byte segments and one registered video."""
+    cache = SegmentCache(10, max_bytes, max_sources)
+    cache.set_source("video", "https://example.com/video=dv")
+    return cache
+
+
+def test_partial_content() -> None:
+    """Test a 206 response caches one segment and records the size."""
+    cache = _cache()
+    data = cache.store_response(
+        "video",
+        1,
+        206,
+        {"Content-Range": "bytes 10-19/25", "Content-Type": "video/quicktime"},
+        b"b" * 10,
+    )
+
+    assert data == b"b" * 10
+    assert cache.get("video", 1) == data
+    assert cache.size("video") == 25
+    assert cache.content_type("video") == "video/quicktime"
+
+
+def test_upstream_ignores_range() -> None:
+    """Test a 200 response caches every segment of the whole body."""
+    cache = _cache()
+    body = b"a" * 10 + b"b" * 10 + b"c" * 5
+
+    assert cache.store_response("video", 1, 200, {}, body) == b"b" * 10
+    assert cache.size("video") == 25
+    assert cache.get("video", 0) == b"a" * 10
+    assert cache.get("video", 2) == b"c" * 5
+    assert cache.content_type("video") == "video/mp4"
+
+
+def test_upstream_error() -> None:
+    """Test an error status is not cached."""
+    cache = _cache()
+    with pytest.raises(UpstreamError):
+        cache.store_response("video", 0, 403, {}, b"forbidden")
+    assert cache.get("video", 0) is None
+    assert cache.size("video") is None
+
+
+def test_segment_eviction() -> None:
+    """Test the least recently used segments are evicted by size."""
+    cache = _cache(max_bytes=20)
+    for index in range(3):
+        cache.store_response(
+            "video", index, 206, {"Content-Range": "bytes 0-9/30"}, bytes(10)
+        )
+
+    assert cache.get("video", 0) is None
+    assert cache.get("video", 2) is not None
+    assert cache.cached_bytes == 20
+
+
+def test_source_eviction() -> None:
+    """Test evicting a video drops its URL, metadata and segments."""
+    cache = _cache(max_sources=2)
+    cache.store_response("video", 0, 200, {"Content-Type": "video/mp4"}, bytes(15))
+    cache.set_source("second", "https://example.com/second=dv")
+    cache.set_source("third", "https://example.com/third=dv")
+
+    assert cache.source("video") is None
+    assert cache.size("video") is None
+    assert cache.get("video", 0) is None
+    assert cache.cached_bytes == 0
+    # Responses for an evicted video are returned but not cached
+    assert cache.store_response("video", 0, 200, {}, bytes(5)) == bytes(5)
+    assert cache.cached_bytes == 0
+
+
+def test_refresh_source() -> None:
+    """Test re-registering a video refreshes its URL and keeps it cached."""
+    cache = _cache(max_sources=2)
+    cache.set_source("second", "https://example.com/second=dv")
+    cache.set_source("video", "https://example.com/fresh=dv")
+    cache.set_source("third", "https://example.com/third=dv")
+
+    assert cache.source("video") == "https://example.com/fresh=dv"
+    assert cache.source("second") is None
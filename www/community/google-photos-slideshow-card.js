@@ -75,12 +75,18 @@ class GooglePhotosSlideshowCard extends HTMLElement {
     const state = this._hass.states[this.entity];
     if (!state) {
       this.content.innerHTML = '<div style="color: white; padding: 20px;">Entity not found: ' + this.entity + '</div>';
+      this._photoUrl = null;
       return;
     }
 
-    const photoUrl = state.attributes.photo_url;
+    // While offline, Google URLs are unreachable; use the camera proxy, which
+    // serves slides from the local cache
+    const photoUrl = state.attributes.offline && state.attributes.entity_picture
+      ? `${state.attributes.entity_picture}&slide=${state.attributes.current_photo}`
+      : state.attributes.photo_url;
     if (!photoUrl) {
       this.content.innerHTML = '<div style="color: white; padding: 20px;">No photo available</div>';
+      this._photoUrl = null;
       return;
     }
 
@@ -92,8 +98,11 @@ class GooglePhotosSlideshowCard extends HTMLElement {
       this.content.appendChild(currentSlide);
     }
 
-    // Update image source
-    if (currentSlide.src !== photoUrl) {
+    // Update image source. hass is set on every state change in Home
+    // Assistant, and img.src is always absolute while the offline URL is
+    // relative, so compare against the last URL applied instead
+    if (this._photoUrl !== photoUrl) {
+      this._photoUrl = photoUrl;
       const newSlide = document.createElement('img');
       newSlide.className = 'slide';
       newSlide.src = photoUrl;
@@ -101,7 +110,9 @@ class GooglePhotosSlideshowCard extends HTMLElement {
         // Fade transition
         currentSlide.classList.remove('active');
         setTimeout(() => {
-          this.content.removeChild(currentSlide);
+          if (currentSlide.parentNode) {
+            currentSlide.parentNode.removeChild(currentSlide);
+          }
         }, this.transitionDuration);
         newSlide.classList.add('active');
       };